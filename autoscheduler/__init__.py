@@ -0,0 +1,20 @@
+"""
+Ядро автоматичного складання розкладу без залежності від GUI.
+
+Пакет можна імпортувати у фонових процесах та пакетних запусках: tkinter не
+використовується взагалі, а openpyxl імпортується лише під час експорту в Excel.
+OR-Tools завантажується лише під час першого звернення до run_solver_and_generate_reports,
+тож перевірка розкладу, порівняння рішень та завантаження даних обходяться без нього.
+"""
+from .data import DAYS, DEFAULT_SLOTS_PER_DAY, INPUT_FILES, WEEK_PATTERNS, WEEK_TITLES, Lecture, create_lectures, load_json, parse_unavailable_slots
+from .errors import ScheduleInputError
+from .loader import NameTable, iter_json_records, load_inputs
+from .validator import validate_schedule
+
+
+def __getattr__(name):
+    # Розв'язувач (і разом з ним OR-Tools) імпортується лише тим, хто його використовує
+    if name == "run_solver_and_generate_reports":
+        from .solver import run_solver_and_generate_reports
+        return run_solver_and_generate_reports
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,28 @@
+"""
+Командний рядок ядра розкладу:
+    python -m autoscheduler validate data1 export/schedule.xlsx
+    python -m autoscheduler tune data1 data2 --seeds 3
+    python -m autoscheduler diff old_solution.json export/solution.json
+"""
+import sys
+
+COMMANDS = {
+    "validate": "autoscheduler.validator",
+    "tune": "autoscheduler.tuning",
+    "diff": "autoscheduler.diff",
+}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in COMMANDS:
+        print(f"Використання: python -m autoscheduler {{{','.join(COMMANDS)}}} ...")
+        return 2
+    import importlib
+    # Модулі команд імпортуються лише для вибраної команди
+    module = importlib.import_module(COMMANDS[argv[0]])
+    return module.main(argv[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""Контрольні точки: збереження проміжних рішень та відновлення з них."""
+import hashlib
+import json
+import os
+import threading
+import time
+
+from ortools.sat.python import cp_model
+
+from .loader import READ_CHUNK_SIZE
+
+# Як часто (у секундах) зберігати поточне найкраще рішення під час розв'язання
+CHECKPOINT_INTERVAL = 30
+CHECKPOINT_FILENAME = "checkpoint.json"
+
+def input_fingerprint(data_folder, filenames, slots_per_day):
+    """Хеш вхідних файлів і кількості пар на день — контрольна точка придатна лише для тих самих даних."""
+    digest = hashlib.sha256(str(slots_per_day).encode())
+    for filename in filenames:
+        # Файл хешується блоками, щоб вхідні дані не завантажувались у пам'ять повністю поруч із моделлю
+        with open(os.path.join(data_folder, filename), "rb") as f:
+            for block in iter(lambda: f.read(READ_CHUNK_SIZE), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+def load_checkpoint(path, fingerprint):
+    """Повертає збережену контрольну точку або None, якщо її немає чи вона для інших вхідних даних."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            checkpoint = json.load(f)
+    except json.JSONDecodeError:
+        return None
+    if checkpoint.get("fingerprint") != fingerprint:
+        return None
+    return checkpoint
+
+class CheckpointCallback(cp_model.CpSolverSolutionCallback):
+    """
+    Періодично записує поточне найкраще рішення на диск, щоб перерваний розв'язок можна було продовжити.
+    Рішення, знайдене раніше ніж через interval секунд після попереднього запису, не втрачається:
+    його дописує таймер, щойно інтервал мине, навіть якщо нових рішень більше немає.
+    Після розв'язання слід викликати stop(), щоб таймер не записав контрольну точку пізніше.
+    """
+    def __init__(self, path, fingerprint, lecture_vars, interval=CHECKPOINT_INTERVAL):
+        cp_model.CpSolverSolutionCallback.__init__(self)
+        self.path = path
+        self.fingerprint = fingerprint
+        # (ключ, індекс змінної слоту, індекс змінної кімнати) — для читання значень з масиву рішення
+        self.lecture_indices = [(key, slot.Index(), room.Index()) for key, slot, room in lecture_vars]
+        self.interval = interval
+        self.last_saved = None
+        self.stage = None # Поточний етап ієрархічної оптимізації (задається перед кожним розв'язанням)
+        self.pending = None # Ще не записане рішення: (відповідь розв'язувача, етап)
+        self.timer = None
+        self.lock = threading.Lock()
+
+    def on_solution_callback(self):
+        # Копія відповіді розв'язувача дешева (без обходу занять у Python); знімок для запису будується лише
+        # тоді, коли його пора записати — не частіше ніж раз на interval секунд
+        with self.lock:
+            self.pending = (self.Response(), self.stage)
+            now = time.monotonic()
+            if self.last_saved is None or now - self.last_saved >= self.interval:
+                self._flush_pending(now)
+            elif self.timer is None:
+                self.timer = threading.Timer(self.last_saved + self.interval - now, self._on_timer)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def _on_timer(self):
+        with self.lock:
+            self.timer = None
+            if self.pending is not None:
+                self._flush_pending(time.monotonic())
+
+    def _flush_pending(self, now):
+        response, stage = self.pending
+        self.pending = None
+        self._write(self._snapshot(response.solution, stage, response.objective_value,
+                                   response.best_objective_bound, response.wall_time))
+        self.last_saved = now
+
+    def stop(self):
+        """Скасовує відкладений запис (викликається після завершення розв'язання)."""
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            self.pending = None
+
+    def save(self, solution, stage_result):
+        """
+        Записує остаточне рішення у файл контрольної точки.
+        solution — значення всіх змінних моделі, stage_result — результат етапу, на якому його знайдено
+        (обидва повертає solve_lexicographic).
+        """
+        if solution is None:
+            return
+        with self.lock:
+            self._write(self._snapshot(solution, stage_result["stage"], stage_result["value"],
+                                       stage_result["best_bound"], stage_result["wall_time"]))
+
+    def _snapshot(self, solution, stage, objective, best_bound, wall_time):
+        return {
+            "fingerprint": self.fingerprint,
+            "stage": stage,
+            "objective": objective,
+            "best_bound": best_bound,
+            "wall_time": wall_time,
+            "assignments": {key: [solution[slot], solution[room]] for key, slot, room in self.lecture_indices},
+        }
+
+    def _write(self, checkpoint):
+        # Запис через тимчасовий файл, щоб збій під час запису не пошкодив попередню контрольну точку
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
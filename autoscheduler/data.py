@@ -0,0 +1,119 @@
+"""Константи, завантаження вхідних даних та об'єкти лекцій."""
+import json
+
+from .errors import ScheduleInputError
+
+# ------------------------- Налаштування -------------------------
+# Кількість пар на день за замовчуванням (перевизначається вводом користувача)
+DEFAULT_SLOTS_PER_DAY = 5
+DAYS = ["Пн", "Вт", "Ср", "Чт", "Пт"]
+INPUT_FILES = ["groups.json", "teachers.json", "subjects.json", "rooms.json"]
+# Тижневий шаблон предмета (поле "week" у groups.json): щотижня, лише непарні або лише парні тижні
+WEEK_PATTERNS = ["weekly", "odd", "even"]
+WEEK_TITLES = {"weekly": "щотижня", "odd": "непарний тиждень", "even": "парний тиждень"}
+
+def week_variants(weeks):
+    """
+    Варіанти тижня, які потрібно розглядати для сутності із заняттями вказаних шаблонів:
+    лише щотижневі заняття — один тиждень, інакше окремо непарний і парний.
+    """
+    return ["odd", "even"] if any(week != "weekly" for week in weeks) else ["weekly"]
+
+def occurs_in(week, variant):
+    """Чи відбувається заняття з шаблоном week у варіанті тижня variant."""
+    return week == "weekly" or week == variant
+
+# ------------------------- Завантаження даних -------------------------
+def load_json(path):
+    """Завантажує JSON-файл з вказаного шляху. FileNotFoundError та JSONDecodeError передаються викликачу."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def parse_slots_per_day(user_slots_per_day):
+    """Перевіряє введену користувачем кількість пар на день."""
+    try:
+        slots_per_day = int(user_slots_per_day)
+        if slots_per_day <= 0:
+            raise ValueError("Кількість пар на день має бути позитивним цілим числом.")
+    except ValueError as e:
+        message = f"Помилка вводу: {e}. Будь ласка, введіть дійсне число для 'Бажана кількість пар на день'."
+        raise ScheduleInputError(message, status=message, title="Помилка вводу")
+    return slots_per_day
+
+def parse_unavailable_slots(entries, slots_per_day):
+    """
+    Перетворює список `unavailable` з teachers.json/rooms.json у множину глобальних індексів слотів.
+    Кожен запис — або назва дня ("Пт", увесь день), або об'єкт {"day": "Вт", "pairs": [1, 2]}.
+    Некоректні записи піднімаються як ValueError з описом помилки.
+    """
+    if entries is not None and not isinstance(entries, list):
+        raise ValueError(f"Поле unavailable має бути списком, отримано: {entries!r}.")
+    unavailable = set()
+    for entry in entries or []:
+        if isinstance(entry, str):
+            day, pairs = entry, None
+        elif isinstance(entry, dict):
+            day, pairs = entry.get("day"), entry.get("pairs")
+        else:
+            raise ValueError(f"Некоректний запис {entry!r} у списку unavailable: очікується назва дня або об'єкт {{\"day\", \"pairs\"}}.")
+        if day not in DAYS:
+            raise ValueError(f"Невідомий день '{day}' у списку unavailable. Допустимі значення: {', '.join(DAYS)}.")
+        d_idx = DAYS.index(day)
+        if pairs is None:
+            pairs = range(1, slots_per_day + 1)
+        elif not isinstance(pairs, list) or not all(isinstance(pair, int) and not isinstance(pair, bool) for pair in pairs):
+            raise ValueError(f"Поле pairs для дня '{day}' у списку unavailable має бути списком цілих номерів пар, отримано: {pairs!r}.")
+        for pair in pairs:
+            # Пари поза межами дня просто ігноруються (наприклад, 6-та пара при 5 парах на день)
+            if 1 <= pair <= slots_per_day:
+                unavailable.add(d_idx * slots_per_day + pair - 1)
+    return unavailable
+
+# Клас для представлення однієї лекції (пари) з усіма її атрибутами.
+class Lecture:
+    """Представляє одну лекцію (пару) з усіма її атрибутами."""
+    def __init__(self, group, subject, teacher, count, duration=1, week="weekly"):
+        self.group = group
+        self.subject = subject
+        self.teacher = teacher
+        self.count = count # Кількість годин/пар на тиждень для цього предмета
+        self.duration = duration # Тривалість одного заняття у парах (2 — здвоєна пара)
+        self.week = week # Тижневий шаблон: "weekly", "odd" або "even" (count — пар на тиждень, коли заняття відбувається)
+        self.vars = [] # Змінні CP-SAT (початковий слот, кімната) для кожного заняття цієї лекції
+        self.allowed_starts = [] # Допустимі початкові слоти заняття (межі дня та доступність викладача)
+        self.allowed_rooms = [] # Індекси аудиторій, тип яких відповідає типу предмета
+
+    @property
+    def sessions(self):
+        """Кількість окремих занять на тиждень."""
+        return self.count // self.duration
+
+def create_lectures(groups, total_slots):
+    """Створює об'єкти Lecture для кожної пари (група, предмет) з groups.json."""
+    lectures = []
+    for group in groups:
+        for subj in group["subjects"]:
+            teacher = subj["teacher"]
+            name = subj["name"]
+            count = subj["hours"]
+            duration = subj.get("duration", 1)
+            week = subj.get("week", "weekly")
+            # Загальна кількість годин предмета не може перевищувати кількість слотів тижня
+            if count > total_slots:
+                raise ScheduleInputError(
+                    f"Предмет '{name}' для групи '{group['name']}' має {count} годин, що перевищує загальну доступну кількість слотів ({total_slots}) для однієї групи. Будь ласка, скоригуйте години або кількість пар на день.",
+                    status="Помилка вхідних даних: години перевищують загальну кількість слотів.",
+                )
+            # Заняття з тривалістю duration пар складаються лише з цілих занять і вміщуються в один день
+            if duration <= 0 or count % duration != 0 or duration > total_slots // len(DAYS):
+                raise ScheduleInputError(
+                    f"Предмет '{name}' для групи '{group['name']}': тривалість заняття {duration} пар має бути додатною, не більшою за кількість пар на день, а кількість годин ({count}) — кратною їй.",
+                    status="Помилка вхідних даних: некоректна тривалість заняття.",
+                )
+            if week not in WEEK_PATTERNS:
+                raise ScheduleInputError(
+                    f"Предмет '{name}' для групи '{group['name']}': невідомий тижневий шаблон '{week}'. Допустимі значення: {', '.join(WEEK_PATTERNS)}.",
+                    status="Помилка вхідних даних: некоректний тижневий шаблон.",
+                )
+            lectures.append(Lecture(group["name"], name, teacher, count, duration, week))
+    return lectures
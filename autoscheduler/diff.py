@@ -0,0 +1,80 @@
+"""
+Порівняння двох рішень (solution.json) та список змінених занять по кожній групі й викладачу.
+
+Приклад:
+    python -m autoscheduler diff export/old_solution.json export/solution.json
+"""
+import argparse
+import json
+from collections import Counter, defaultdict
+
+from .data import WEEK_TITLES
+
+# Сутності, для яких формуються окремі аркуші розкладу: (ключ у маніфесті, поле заняття)
+ENTITY_KINDS = [("groups", "group"), ("teachers", "teacher")]
+LESSON_FIELDS = ("day", "pair", "subject", "group", "teacher", "room", "week")
+# Значення полів, яких немає у старих solution.json
+LESSON_DEFAULTS = {"week": "weekly"}
+
+
+def lesson_key(lesson):
+    """Незмінне представлення заняття для порівняння множин занять."""
+    return tuple(lesson[field] if field in lesson else LESSON_DEFAULTS[field] for field in LESSON_FIELDS)
+
+
+def load_lessons(path):
+    """Завантажує список занять з solution.json."""
+    with open(path, "r", encoding="utf-8") as f:
+        solution = json.load(f)
+    return solution["lessons"] if isinstance(solution, dict) else solution
+
+
+def diff_solutions(old_lessons, new_lessons):
+    """
+    Повертає {"groups": {назва: {"removed": [...], "added": [...]}}, "teachers": {...}}
+    лише для сутностей, у розкладі яких щось змінилося. Перенесене заняття
+    з'являється як видалене зі старого місця та додане в новому.
+    """
+    changes = {}
+    for kind, field in ENTITY_KINDS:
+        old_by_entity = defaultdict(Counter)
+        new_by_entity = defaultdict(Counter)
+        for lesson in old_lessons:
+            old_by_entity[lesson[field]][lesson_key(lesson)] += 1
+        for lesson in new_lessons:
+            new_by_entity[lesson[field]][lesson_key(lesson)] += 1
+        changes[kind] = {}
+        for entity in sorted(old_by_entity.keys() | new_by_entity.keys()):
+            removed = old_by_entity[entity] - new_by_entity[entity]
+            added = new_by_entity[entity] - old_by_entity[entity]
+            if removed or added:
+                changes[kind][entity] = {
+                    "removed": [dict(zip(LESSON_FIELDS, key)) for key in sorted(removed.elements())],
+                    "added": [dict(zip(LESSON_FIELDS, key)) for key in sorted(added.elements())],
+                }
+    return changes
+
+
+def format_changes(changes):
+    """Короткий текстовий опис змін для звіту."""
+    lines = []
+    for kind, label in (("groups", "Група"), ("teachers", "Викладач")):
+        for entity, entity_changes in changes[kind].items():
+            lines.append(f"{label} {entity}:")
+            for sign, key in (("-", "removed"), ("+", "added")):
+                for lesson in entity_changes[key]:
+                    week = "" if lesson["week"] == "weekly" else f", {WEEK_TITLES[lesson['week']]}"
+                    lines.append(f"  {sign} {lesson['day']} пара {lesson['pair']}: {lesson['subject']} ({lesson['room']}{week})")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Порівняння двох розкладів (solution.json).")
+    parser.add_argument("old", help="Попередній solution.json")
+    parser.add_argument("new", help="Новий solution.json")
+    args = parser.parse_args(argv)
+
+    changes = diff_solutions(load_lessons(args.old), load_lessons(args.new))
+    for line in format_changes(changes):
+        print(line)
+    print(f"Змінено розклад: груп — {len(changes['groups'])}, викладачів — {len(changes['teachers'])}")
@@ -0,0 +1,13 @@
+"""Структуровані помилки ядра розкладу (без залежності від GUI)."""
+
+
+class ScheduleInputError(ValueError):
+    """
+    Помилка вхідних даних. Містить заголовок і детальний опис для показу користувачу
+    та короткий статус для рядка стану GUI або журналу пакетного запуску.
+    """
+    def __init__(self, message, status=None, title="Помилка вхідних даних"):
+        super().__init__(message)
+        self.message = message
+        self.status = status or f"{title}: {message}"
+        self.title = title
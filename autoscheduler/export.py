@@ -0,0 +1,119 @@
+"""Експорт розкладу у файли. openpyxl імпортується лише під час запису Excel."""
+import json
+import os
+
+from .data import DAYS, WEEK_TITLES, occurs_in
+
+EXPORT_DIRNAME = "export"
+
+
+def export_folder_path():
+    """Папка експорту в поточній робочій директорії."""
+    return os.path.join(os.getcwd(), EXPORT_DIRNAME)
+
+
+def write_solution_json(export_folder, lessons, slots_per_day):
+    """Зберігає канонічне представлення рішення (плоский список занять) у solution.json."""
+    with open(os.path.join(export_folder, "solution.json"), "w", encoding="utf-8") as f:
+        json.dump({"slots_per_day": slots_per_day, "lessons": lessons}, f, ensure_ascii=False, indent=4)
+
+
+def load_previous_solution(export_folder, slots_per_day):
+    """
+    Повертає заняття попереднього solution.json або None, якщо його немає
+    чи він складений для іншої кількості пар на день (тоді потрібен повний експорт).
+    """
+    path = os.path.join(export_folder, "solution.json")
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            solution = json.load(f)
+    except json.JSONDecodeError:
+        return None
+    if solution.get("slots_per_day") != slots_per_day:
+        return None
+    return solution["lessons"]
+
+
+def write_changes_manifest(export_folder, changes):
+    """
+    Зберігає перелік змінених сутностей та їхніх занять у changes.json.
+    changes None означає повний експорт: changes.json попереднього запуску видаляється, бо описує інший експорт.
+    """
+    path = os.path.join(export_folder, "changes.json")
+    if changes is None:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(changes, f, ensure_ascii=False, indent=4)
+
+
+def entry_week(entry):
+    """Тижневий шаблон запису розкладу (п'ятий елемент кортежу; без нього — щотижня)."""
+    return entry[4] if len(entry) > 4 else "weekly"
+
+
+def fill_sheet(ws, days, header):
+    """
+    Заповнює аркуш розкладу однієї сутності.
+    Якщо у сутності є заняття лише непарного чи парного тижня, аркуш містить обидва варіанти тижня
+    (щотижневі заняття — в кожному) з додатковою колонкою "Тиждень".
+    """
+    if not any(entry_week(entry) != "weekly" for entries in days.values() for entry in entries):
+        # Заголовок стовпців
+        ws.append(header)
+        for day in DAYS:
+            entries = days.get(day, [])
+            # Сортування записів за номером пари
+            for entry in sorted(entries):
+                # Розпаковуємо дані безпосередньо з кортежу
+                pair, subject_name, third_col_value, auditorium_name = entry[:4]
+                ws.append([day, pair, subject_name, third_col_value, auditorium_name])
+        return
+
+    ws.append(["Тиждень"] + header)
+    for variant in ("odd", "even"):
+        for day in DAYS:
+            for entry in sorted(days.get(day, [])):
+                if occurs_in(entry_week(entry), variant):
+                    pair, subject_name, third_col_value, auditorium_name = entry[:4]
+                    ws.append([WEEK_TITLES[variant], day, pair, subject_name, third_col_value, auditorium_name])
+
+
+def write_timetable_xlsx(filepath, timetable, header, changed_names=None):
+    """
+    Записує розклад у Excel: окремий аркуш для кожної групи/викладача.
+    timetable[назва][день] — список кортежів (пара, предмет, третя колонка, аудиторія[, тиждень]).
+    Якщо задано changed_names і файл уже існує, а змін немає, файл не чіпається взагалі;
+    інакше файл записується повністю (перелік змін — у changes.json).
+    """
+    from openpyxl import Workbook
+
+    # Без змін файл лишається як є. Вибіркове перезаписування аркушів (load_workbook + save) не використовується:
+    # openpyxl однаково розбирає і зберігає всю книгу, тож це повільніше за повний запис
+    if changed_names is not None and not changed_names and os.path.exists(filepath):
+        return
+
+    wb = Workbook()
+    # Видалення стандартного аркуша 'Sheet', якщо він був створений
+    if 'Sheet' in wb.sheetnames:
+        del wb['Sheet']
+    for name, days in timetable.items():
+        # Створення аркуша для кожної сутності, обмежуючи назву до 31 символу
+        fill_sheet(wb.create_sheet(title=name[:31]), days, header)
+    wb.save(filepath)
+
+
+def export_excel(export_folder, timetable, timetable_teachers, changes=None):
+    """
+    Зберігає schedule.xlsx (групи) та teachers_schedule.xlsx (викладачі).
+    changes — результат diff_solutions з попереднім рішенням; None означає повний експорт.
+    """
+    changed_groups = None if changes is None else set(changes["groups"])
+    changed_teachers = None if changes is None else set(changes["teachers"])
+    write_timetable_xlsx(os.path.join(export_folder, "schedule.xlsx"), timetable,
+                         ["День", "Пара", "Предмет", "Викладач", "Аудиторія"], changed_groups)
+    write_timetable_xlsx(os.path.join(export_folder, "teachers_schedule.xlsx"), timetable_teachers,
+                         ["День", "Пара", "Предмет", "Група", "Аудиторія"], changed_teachers)
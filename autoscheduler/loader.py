@@ -0,0 +1,259 @@
+"""
+Потокове завантаження вхідних даних з перевіркою посилань між файлами.
+
+Кожен файл може бути звичайним JSON-масивом або NDJSON (один JSON-об'єкт на рядок).
+Записи читаються по одному, без завантаження всього файлу в пам'ять: малі довідники
+(викладачі, предмети, аудиторії) читаються першими, а великий groups.json перевіряється
+проти них за один прохід. Назви інтернуються — кожна назва зберігається одним екземпляром рядка,
+тож повторення викладачів і предметів у тисячах рядків не дублюють рядки.
+"""
+import json
+import os
+
+from .data import INPUT_FILES, WEEK_PATTERNS
+from .errors import ScheduleInputError
+
+# Розмір блоку читання для потокового розбору JSON-масиву
+READ_CHUNK_SIZE = 1 << 16
+# Скільки помилок перевірки показувати користувачу (решта лише підраховується)
+MAX_REPORTED_ERRORS = 20
+
+_WHITESPACE = " \t\r\n"
+# Символи, якими може продовжуватися число: якщо блок обірвався на них, число може бути неповним
+_NUMBER_CHARS = "0123456789.eE+-"
+
+
+class NameTable:
+    """Інтернування назв: один збережений екземпляр рядка на назву."""
+    def __init__(self):
+        self.names = {}
+
+    def canonical(self, name):
+        """Повертає єдиний збережений екземпляр рядка для назви, додаючи її до таблиці за потреби."""
+        return self.names.setdefault(name, name)
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def __len__(self):
+        return len(self.names)
+
+
+def _iter_json_array(f, path):
+    """Потоково розбирає JSON-масив верхнього рівня і повертає його елементи по одному."""
+    decoder = json.JSONDecoder()
+    buf = f.read(READ_CHUNK_SIZE)
+    eof = not buf
+    pos = 0
+    consumed = 0 # Скільки символів файлу вже відкинуто з буфера (для позицій у повідомленнях про помилки)
+
+    def skip_whitespace():
+        nonlocal buf, pos, eof, consumed
+        while True:
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buf) or eof:
+                return
+            consumed += len(buf)
+            buf, pos = f.read(READ_CHUNK_SIZE), 0
+            eof = not buf
+
+    def expect_end():
+        # Після закривальної "]" дозволені лише пробільні символи
+        nonlocal pos
+        pos += 1
+        skip_whitespace()
+        if pos < len(buf):
+            raise json.JSONDecodeError(f"Зайві дані після JSON-масиву (символ {consumed + pos})", buf, pos)
+
+    skip_whitespace()
+    pos += 1 # "["
+    skip_whitespace()
+    if pos < len(buf) and buf[pos] == "]":
+        expect_end()
+        return
+    while True:
+        # Розбираємо наступний елемент; якщо він обірваний на межі блоку — дочитуємо файл.
+        # Число, за яким у блоці йде можливе продовження ("763" + ".5"), теж може бути неповним.
+        while True:
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+                if eof or (end < len(buf) and not (isinstance(item, (int, float)) and buf[end] in _NUMBER_CHARS)):
+                    break
+            except json.JSONDecodeError as e:
+                if eof:
+                    raise json.JSONDecodeError(e.msg, buf, e.pos) from None
+            chunk = f.read(READ_CHUNK_SIZE)
+            eof = not chunk
+            buf = buf[pos:] + chunk
+            consumed += pos
+            pos = 0
+        yield item
+        pos = end
+        skip_whitespace()
+        if pos >= len(buf):
+            raise json.JSONDecodeError(f"Незавершений JSON-масив у файлі {path}", buf, pos)
+        if buf[pos] == "]":
+            expect_end()
+            return
+        if buf[pos] != ",":
+            raise json.JSONDecodeError(f"Очікувалася ',' або ']' (символ {consumed + pos})", buf, pos)
+        pos += 1
+        skip_whitespace()
+        # Відкидаємо вже розібрану частину буфера, щоб він не ріс разом з файлом
+        consumed += pos
+        buf, pos = buf[pos:], 0
+
+
+def iter_json_records(path):
+    """
+    Повертає записи файлу по одному: елементи JSON-масиву або рядки NDJSON.
+    Формат визначається за першим непробільним символом ("[" — масив).
+    Помилки синтаксису піднімаються як json.JSONDecodeError.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        first = f.read(1)
+        while first and first in _WHITESPACE:
+            first = f.read(1)
+        f.seek(0)
+        if first == "[":
+            yield from _iter_json_array(f, path)
+            return
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise json.JSONDecodeError(f"{e.msg} (рядок {line_number})", line, e.pos) from None
+
+
+class _InputValidator:
+    """Збирає помилки перевірки вхідних даних (не більше MAX_REPORTED_ERRORS для показу)."""
+    def __init__(self):
+        self.errors = []
+        self.count = 0
+
+    def error(self, message):
+        self.count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(message)
+
+    def named_record(self, record, filename, index, table):
+        """Перевіряє, що запис — об'єкт з унікальною назвою; повертає інтерновану назву або None."""
+        if not isinstance(record, dict) or not isinstance(record.get("name"), str):
+            self.error(f"{filename}, запис {index}: очікується об'єкт з текстовим полем \"name\".")
+            return None
+        name = record["name"]
+        if name in table:
+            self.error(f"{filename}: назва '{name}' повторюється.")
+        return table.canonical(name)
+
+    def raise_if_failed(self):
+        if self.count:
+            hidden = self.count - len(self.errors)
+            message = "Помилки у вхідних даних:\n" + "\n".join(self.errors)
+            if hidden:
+                message += f"\n... та ще {hidden} помилок."
+            raise ScheduleInputError(message, status="Помилка вхідних даних: некоректні записи або посилання між файлами.")
+
+
+def _read_records(data_folder, filename):
+    path = os.path.join(data_folder, filename)
+    try:
+        # Записи читаються потоково, але довідник повністю матеріалізується — він потрібен для перевірки посилань
+        return list(iter_json_records(path))
+    except json.JSONDecodeError as e:
+        raise _json_error(path, e)
+
+
+def _json_error(path, e):
+    return ScheduleInputError(
+        f"Помилка декодування JSON у файлі: {path}. Переконайтеся, що файл має коректний формат JSON або NDJSON.",
+        status=f"Помилка завантаження даних: {e}",
+        title="Помилка JSON",
+    )
+
+
+def load_inputs(data_folder):
+    """
+    Завантажує groups.json, teachers.json, subjects.json та rooms.json з папки (JSON-масив або NDJSON).
+    Перевіряє посилання: викладачі та предмети груп мають бути описані у teachers.json і subjects.json,
+    а для кожного типу предмета має існувати аудиторія цього типу.
+    Відсутні чи пошкоджені файли та некоректні посилання перетворюються на ScheduleInputError.
+    """
+    missing_files = [filename for filename in INPUT_FILES if not os.path.exists(os.path.join(data_folder, filename))]
+    if missing_files:
+        raise ScheduleInputError(
+            "Відсутні наступні файли у вибраній папці:\n" + "\n".join(missing_files) + "\nБудь ласка, переконайтеся, що всі необхідні JSON файли знаходяться у вказаній папці.",
+            status="Помилка вхідних даних: відсутні файли.",
+        )
+    validator = _InputValidator()
+    teacher_names, subject_names, room_names, group_names = NameTable(), NameTable(), NameTable(), NameTable()
+
+    # Довідники: невеликі, читаються першими
+    teachers = _read_records(data_folder, "teachers.json")
+    for i, teacher in enumerate(teachers):
+        name = validator.named_record(teacher, "teachers.json", i, teacher_names)
+        if name is not None:
+            teacher["name"] = name
+    rooms = _read_records(data_folder, "rooms.json")
+    room_types = set()
+    for i, room in enumerate(rooms):
+        name = validator.named_record(room, "rooms.json", i, room_names)
+        if name is not None:
+            room["name"] = name
+            room_types.add(room.get("type", ""))
+    subjects = _read_records(data_folder, "subjects.json")
+    for i, subject in enumerate(subjects):
+        name = validator.named_record(subject, "subjects.json", i, subject_names)
+        if name is None:
+            continue
+        subject["name"] = name
+        subject_type = subject.get("type", "")
+        if subject_type and subject_type not in room_types:
+            validator.error(f"subjects.json: для предмета '{name}' немає жодної аудиторії типу '{subject_type}'.")
+
+    # Групи: потоково, кожен рядок одразу перевіряється та стискається до потрібних полів з інтернованими назвами
+    groups = []
+    groups_path = os.path.join(data_folder, "groups.json")
+    try:
+        for i, group in enumerate(iter_json_records(groups_path)):
+            name = validator.named_record(group, "groups.json", i, group_names)
+            if name is None:
+                continue
+            group_subjects = group.get("subjects")
+            if not isinstance(group_subjects, list):
+                validator.error(f"groups.json: група '{name}' не має списку \"subjects\".")
+                continue
+            compact_subjects = []
+            for subj in group_subjects:
+                if not isinstance(subj, dict):
+                    validator.error(f"groups.json: група '{name}' має некоректний запис предмета.")
+                    continue
+                subject_name, teacher = subj.get("name"), subj.get("teacher")
+                if subject_name not in subject_names:
+                    validator.error(f"groups.json: група '{name}' — предмет '{subject_name}' відсутній у subjects.json.")
+                    continue
+                if teacher not in teacher_names:
+                    validator.error(f"groups.json: група '{name}', предмет '{subject_name}' — викладач '{teacher}' відсутній у teachers.json.")
+                    continue
+                hours, duration = subj.get("hours"), subj.get("duration", 1)
+                if not isinstance(hours, int) or hours <= 0 or not isinstance(duration, int):
+                    validator.error(f"groups.json: група '{name}', предмет '{subject_name}' — \"hours\" і \"duration\" мають бути цілими додатними числами.")
+                    continue
+                if subj.get("week", "weekly") not in WEEK_PATTERNS:
+                    validator.error(f"groups.json: група '{name}', предмет '{subject_name}' — невідомий тижневий шаблон '{subj['week']}'.")
+                    continue
+                compact = {"name": subject_names.canonical(subject_name), "teacher": teacher_names.canonical(teacher), "hours": hours}
+                for optional in ("duration", "week"):
+                    if optional in subj:
+                        compact[optional] = subj[optional]
+                compact_subjects.append(compact)
+            groups.append({"name": name, "subjects": compact_subjects})
+    except json.JSONDecodeError as e:
+        raise _json_error(groups_path, e)
+
+    validator.raise_if_failed()
+    return groups, teachers, subjects, rooms
@@ -0,0 +1,449 @@
+"""
+Побудова моделі CP-SAT незалежними фрагментами.
+
+Модель ділиться на фрагменти: по одному на групу (змінні занять групи, NoOverlap групи,
+зайнятість та вікна), на викладача (NoOverlap, зайнятість та вікна) і на тип аудиторії
+(вибір аудиторії та NoOverlap аудиторій). Спільний індекс змінних обчислюється заздалегідь:
+кожен фрагмент знає, з якого глобального індексу починаються його змінні і де лежать
+змінні занять, що належать фрагментам груп. Тому фрагменти можна будувати в окремих
+процесах як часткові CpModelProto та просто дописати до спільної моделі.
+
+Заняття непарного та парного тижня використовують ту саму тижневу модель: для сутності з такими
+заняттями NoOverlap, зайнятість і вікна будуються окремо для кожного варіанта тижня
+(щотижневі заняття входять в обидва), тож непарне і парне заняття можуть ділити один слот.
+"""
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from ortools.sat.python import cp_model, cp_model_helper
+
+from .data import DAYS, occurs_in, week_variants
+from .errors import ScheduleInputError
+
+# Від скількох занять на тиждень модель будується паралельно (для малих задач запуск процесів дорожчий)
+PARALLEL_BUILD_MIN_SESSIONS = 2000
+
+INT_MIN = -(2 ** 63) + 1
+INT_MAX = 2 ** 63 - 1
+
+
+def _domain_from_values(values):
+    """Перетворює відсортований список значень у плаский список інтервалів домену [a0, b0, a1, b1, ...]."""
+    flat = []
+    for v in values:
+        if flat and flat[-1] == v - 1:
+            flat[-1] = v
+        else:
+            flat.extend([v, v])
+    return flat
+
+
+class ModelFragment:
+    """
+    Частковий CpModelProto. Змінні фрагмента отримують глобальні індекси, починаючи з var_offset;
+    змінні інших фрагментів використовуються за їхніми глобальними індексами.
+    Інтервали посилаються на обмеження за локальними індексами — вони зсуваються під час злиття.
+    """
+    def __init__(self, var_offset):
+        self.proto = cp_model_helper.CpModelProto()
+        self.var_offset = var_offset
+        self.var_count = 0
+        self.no_overlaps = [] # Локальні індекси обмежень NoOverlap (для зсуву індексів інтервалів)
+
+    def new_var(self, domain):
+        var = self.proto.variables.add()
+        var.domain.extend(domain)
+        self.var_count += 1
+        return self.var_offset + self.var_count - 1
+
+    def new_bool(self):
+        return self.new_var([0, 1])
+
+    def _add(self, enforcement=()):
+        ct = self.proto.constraints.add()
+        if enforcement:
+            ct.enforcement_literal.extend(enforcement)
+        return ct
+
+    def add_linear(self, variables, coeffs, domain, enforcement=()):
+        ct = self._add(enforcement)
+        ct.linear.vars.extend(variables)
+        ct.linear.coeffs.extend(coeffs)
+        ct.linear.domain.extend(domain)
+
+    def add_equal(self, var, value, enforcement=()):
+        self.add_linear([var], [1], [value, value], enforcement)
+
+    def add_not_equal(self, var, value, enforcement=()):
+        self.add_linear([var], [1], [INT_MIN, value - 1, value + 1, INT_MAX], enforcement)
+
+    def add_bool_or(self, literals, enforcement=()):
+        self._add(enforcement).bool_or.literals.extend(literals)
+
+    def add_bool_and(self, literals, enforcement=()):
+        self._add(enforcement).bool_and.literals.extend(literals)
+
+    def add_exactly_one(self, literals):
+        self._add().exactly_one.literals.extend(literals)
+
+    def add_interval(self, start_var, size, presence=None, fixed_start=None):
+        """Інтервал [start, start + size); fixed_start задає сталий інтервал. Повертає локальний індекс обмеження."""
+        ct = self._add([presence] if presence is not None else ())
+        for expr, offset in ((ct.interval.start, 0), (ct.interval.end, size)):
+            if fixed_start is None:
+                expr.vars.append(start_var)
+                expr.coeffs.append(1)
+                expr.offset = offset
+            else:
+                expr.offset = fixed_start + offset
+        ct.interval.size.offset = size
+        return len(self.proto.constraints) - 1
+
+    def add_no_overlap(self, intervals):
+        if len(intervals) > 1:
+            self._add().no_overlap.intervals.extend(intervals)
+            self.no_overlaps.append(len(self.proto.constraints) - 1)
+
+
+def _negated(literal):
+    return -literal - 1
+
+
+def _add_week_no_overlaps(fragment, intervals, weeks):
+    """NoOverlap для кожного варіанта тижня: заняття непарного і парного тижня між собою не конфліктують."""
+    for variant in week_variants(weeks):
+        fragment.add_no_overlap([interval for interval, week in zip(intervals, weeks) if occurs_in(week, variant)])
+
+
+def _add_week_occupancy_and_windows(fragment, sessions, slots_per_day):
+    """
+    Зайнятість і вікна для кожного варіанта тижня сутності.
+    sessions — список (тривалість, допустимі початки, індекс першої змінної "починається у слоті", тиждень).
+    Повертає ({варіант: occupied[день][пара]}, {варіант: список літералів вікон}).
+    """
+    occupied, windows = {}, {}
+    for variant in week_variants([week for *_, week in sessions]):
+        occupied[variant], windows[variant] = _add_occupancy_and_windows(
+            fragment, [session[:3] for session in sessions if occurs_in(session[3], variant)], slots_per_day)
+    return occupied, windows
+
+
+def _add_occupancy_and_windows(fragment, sessions, slots_per_day):
+    """
+    Змінні зайнятості слотів та "вікон" для однієї групи або викладача в одному варіанті тижня.
+    sessions — список (тривалість, допустимі початки, індекс першої змінної "починається у слоті").
+    Повертає (occupied[день][пара], список літералів вікон).
+    """
+    # Літерали "заняття займає слот" для кожного глобального слоту
+    covering = defaultdict(list)
+    for duration, allowed_starts, starts_base in sessions:
+        for pos, start in enumerate(allowed_starts):
+            for k in range(duration):
+                covering[start + k].append(starts_base + pos)
+
+    occupied = [[fragment.new_bool() for _ in range(slots_per_day)] for _ in DAYS]
+    window_literals = []
+    for d_idx in range(len(DAYS)):
+        row = occupied[d_idx]
+        for s_idx in range(slots_per_day):
+            literals = covering.get(d_idx * slots_per_day + s_idx)
+            # Слот зайнятий тоді й лише тоді, коли хоча б одне заняття його покриває
+            if literals:
+                fragment.add_bool_or(literals, [row[s_idx]])
+                fragment.add_bool_and([_negated(lit) for lit in literals], [_negated(row[s_idx])])
+            else:
+                fragment.add_equal(row[s_idx], 0)
+
+        # Створюємо булеві змінні для перевірки наявності зайнятих слотів до/після поточного
+        has_prev = [fragment.new_bool() for _ in range(slots_per_day)]
+        has_next = [fragment.new_bool() for _ in range(slots_per_day)]
+        for s_idx in range(slots_per_day):
+            if s_idx > 0:
+                fragment.add_bool_or(row[:s_idx], [has_prev[s_idx]])
+                fragment.add_bool_and([_negated(lit) for lit in row[:s_idx]], [_negated(has_prev[s_idx])])
+            else:
+                fragment.add_equal(has_prev[s_idx], 0) # Для першого слота немає попередніх
+            if s_idx < slots_per_day - 1:
+                fragment.add_bool_or(row[s_idx + 1:], [has_next[s_idx]])
+                fragment.add_bool_and([_negated(lit) for lit in row[s_idx + 1:]], [_negated(has_next[s_idx])])
+            else:
+                fragment.add_equal(has_next[s_idx], 0) # Для останнього слота немає наступних
+
+            # Слот є вікном тоді й лише тоді, коли він вільний І є заняття до нього І є заняття після нього
+            # (зворотна імплікація потрібна, інакше розв'язувач просто ставить вікно в 0 при мінімізації)
+            is_window = fragment.new_bool()
+            fragment.add_bool_and([_negated(row[s_idx]), has_prev[s_idx], has_next[s_idx]], [is_window])
+            fragment.add_bool_or([row[s_idx], _negated(has_prev[s_idx]), _negated(has_next[s_idx])], [_negated(is_window)])
+            window_literals.append(is_window)
+    return occupied, window_literals
+
+
+def occupancy_var_count(slots_per_day, weeks=()):
+    """Кількість змінних, які створює _add_week_occupancy_and_windows (зайнятість, до, після, вікно на кожен варіант тижня)."""
+    return 4 * len(DAYS) * slots_per_day * len(week_variants(weeks))
+
+
+def build_group_fragment(spec):
+    """Змінні занять групи (початок, аудиторія, "починається у слоті"), NoOverlap групи, зайнятість і вікна."""
+    fragment = ModelFragment(spec["var_offset"])
+    intervals = []
+    sessions = []
+    for duration, allowed_starts, allowed_rooms, week in spec["sessions"]:
+        start = fragment.new_var(_domain_from_values(allowed_starts))
+        fragment.new_var(_domain_from_values(allowed_rooms))
+        starts_base = fragment.var_offset + fragment.var_count
+        starts_at = [fragment.new_bool() for _ in allowed_starts]
+        for s, starts_here in zip(allowed_starts, starts_at):
+            fragment.add_equal(start, s, [starts_here])
+            fragment.add_not_equal(start, s, [_negated(starts_here)])
+        fragment.add_exactly_one(starts_at)
+        intervals.append(fragment.add_interval(start, duration))
+        sessions.append((duration, allowed_starts, starts_base, week))
+    _add_week_no_overlaps(fragment, intervals, [week for *_, week in sessions])
+    occupied, windows = _add_week_occupancy_and_windows(fragment, sessions, spec["slots_per_day"])
+    return fragment, {"occupied": occupied, "windows": windows}
+
+
+def build_teacher_fragment(spec):
+    """NoOverlap занять викладача, зайнятість і вікна (змінні занять належать фрагментам груп)."""
+    fragment = ModelFragment(spec["var_offset"])
+    intervals = [fragment.add_interval(start, duration) for start, duration, *_ in spec["sessions"]]
+    _add_week_no_overlaps(fragment, intervals, [week for *_, week in spec["sessions"]])
+    if not spec["var_count"]:
+        # Викладача немає у teachers.json — лише NoOverlap, без підрахунку вікон
+        return fragment, {}
+    sessions = [session[1:] for session in spec["sessions"]]
+    occupied, windows = _add_week_occupancy_and_windows(fragment, sessions, spec["slots_per_day"])
+    return fragment, {"occupied": occupied, "windows": windows}
+
+
+def build_room_type_fragment(spec):
+    """
+    Вибір аудиторії для занять, що можуть проходити в аудиторіях цього типу, та NoOverlap
+    кожної аудиторії (з фіксованими інтервалами для недоступних слотів).
+    """
+    fragment = ModelFragment(spec["var_offset"])
+    # Для кожної аудиторії — список (інтервал, тиждень); недоступність діє щотижня
+    intervals_by_room = defaultdict(list)
+    for room, slots in spec["unavailable"].items():
+        for s in slots:
+            intervals_by_room[room].append((fragment.add_interval(None, 1, fixed_start=s), "weekly"))
+    for start, room_var, duration, allowed_rooms, rooms_here, week in spec["sessions"]:
+        if len(allowed_rooms) == 1:
+            intervals_by_room[allowed_rooms[0]].append((fragment.add_interval(start, duration), week))
+            continue
+        for r in rooms_here:
+            in_room = fragment.new_bool()
+            fragment.add_equal(room_var, r, [in_room])
+            fragment.add_not_equal(room_var, r, [_negated(in_room)])
+            intervals_by_room[r].append((fragment.add_interval(start, duration, presence=in_room), week))
+    for room in sorted(intervals_by_room):
+        intervals, weeks = zip(*intervals_by_room[room])
+        _add_week_no_overlaps(fragment, intervals, weeks)
+    return fragment, {}
+
+
+FRAGMENT_BUILDERS = {
+    "group": build_group_fragment,
+    "teacher": build_teacher_fragment,
+    "room_type": build_room_type_fragment,
+}
+
+
+def build_fragment_proto(spec):
+    """Будує фрагмент у поточному процесі. Повертає (CpModelProto фрагмента, локальні індекси NoOverlap, дескриптори)."""
+    fragment, outputs = FRAGMENT_BUILDERS[spec["kind"]](spec)
+    if fragment.var_count != spec["var_count"]:
+        raise RuntimeError(f"Фрагмент {spec['kind']} створив {fragment.var_count} змінних замість {spec['var_count']}")
+    return fragment.proto, fragment.no_overlaps, outputs
+
+
+def build_fragment(spec):
+    """Будує фрагмент в окремому процесі і повертає його у вигляді, придатному для передачі між процесами."""
+    proto, no_overlaps, outputs = build_fragment_proto(spec)
+    # CpModelProto з C++-обгорткою не серіалізується pickle, тому передаємо текстовий формат
+    return str(proto), no_overlaps, outputs
+
+
+def merge_fragment(model, fragment, no_overlaps, var_offset):
+    """
+    Дописує фрагмент до моделі, зсуваючи локальні індекси інтервалів у NoOverlap.
+    fragment — CpModelProto (побудова в цьому процесі) або його текстовий формат (з пулу процесів).
+    """
+    proto = model.Proto()
+    if len(proto.variables) != var_offset:
+        raise RuntimeError("Фрагменти потрібно зливати в порядку спільного індексу змінних")
+    ct_offset = len(proto.constraints)
+    if isinstance(fragment, str):
+        proto.merge_text_format(fragment)
+    else:
+        proto.merge_from(fragment)
+    for local in no_overlaps:
+        intervals = proto.constraints[ct_offset + local].no_overlap.intervals
+        shifted = [ct_offset + i for i in intervals]
+        intervals.clear()
+        intervals.extend(shifted)
+
+
+class ScheduleModel:
+    """Побудована модель разом з дескрипторами змінних, потрібними для розв'язання та звіту."""
+    def __init__(self, model, lectures, group_occupied, teacher_occupied, group_windows, teacher_windows):
+        self.model = model
+        self.lectures = lectures # lec.vars — (початок, аудиторія) для кожного заняття
+        self.group_occupied = group_occupied # [група][варіант тижня][день][пара] -> булева змінна
+        self.teacher_occupied = teacher_occupied # [викладач][варіант тижня][день][пара] -> булева змінна
+        self.group_windows = group_windows # [група][варіант тижня] -> список літералів "слот є вікном"
+        self.teacher_windows = teacher_windows # [викладач][варіант тижня] -> список літералів "слот є вікном"
+        # Є заняття лише непарного/парного тижня — вікна рахуються за обидва тижні
+        self.has_week_patterns = any(lecture.week != "weekly" for lecture in lectures)
+
+    def window_weight(self, variant):
+        """
+        Вага вікна варіанта тижня: якщо в розкладі є непарні/парні заняття, вікна рахуються за два тижні,
+        тож вікно сутності лише зі щотижневими заняттями повторюється двічі.
+        """
+        return 2 if self.has_week_patterns and variant == "weekly" else 1
+
+    def weighted_windows(self, windows_by_variant):
+        """Пари (літерали вікон, ваги) для всіх варіантів тижня однієї сутності."""
+        literals, weights = [], []
+        for variant, window_literals in windows_by_variant.items():
+            literals.extend(window_literals)
+            weights.extend([self.window_weight(variant)] * len(window_literals))
+        return literals, weights
+
+    def total_windows(self, solution):
+        """Зважена кількість вікон груп і викладачів у рішенні (значення всіх змінних моделі)."""
+        total = 0
+        for windows_by_variant in (*self.group_windows.values(), *self.teacher_windows.values()):
+            literals, weights = self.weighted_windows(windows_by_variant)
+            total += sum(solution[lit.Index()] * weight for lit, weight in zip(literals, weights))
+        return total
+
+
+def build_schedule_model(lectures, group_names, teacher_names, rooms, subject_types,
+                         teacher_unavailable, room_unavailable, slots_per_day, workers=None):
+    """
+    Будує модель CP-SAT з фрагментів. workers — кількість процесів для побудови;
+    None означає автоматичний вибір (паралельно лише для великих задач).
+    """
+    total_slots = len(DAYS) * slots_per_day
+    room_indices = list(range(len(rooms)))
+
+    # Допустимі початки та аудиторії для кожної лекції
+    # Недоступність викладача та межі дня одразу звужують домен змінної початку, а не додають окремі обмеження
+    for lecture in lectures:
+        duration = lecture.duration
+        unavailable = teacher_unavailable.get(lecture.teacher, ())
+        allowed_starts = [s for s in range(total_slots)
+                          if s % slots_per_day + duration <= slots_per_day
+                          and all(s + k not in unavailable for k in range(duration))]
+        if len(allowed_starts) < lecture.sessions:
+            raise ScheduleInputError(
+                f"Викладач '{lecture.teacher}' доступний лише у {len(allowed_starts)} можливих початках заняття, але предмет '{lecture.subject}' для групи '{lecture.group}' потребує {lecture.sessions} занять.",
+                status="Помилка вхідних даних: викладач недоступний у достатній кількості слотів.",
+            )
+        # Тип аудиторії повинен відповідати типу предмета — невідповідні аудиторії виключаються з домену
+        subject_type = subject_types.get(lecture.subject, "")
+        allowed_rooms = [r for r in room_indices if subject_type == "" or rooms[r].get("type", "") == subject_type]
+        if not allowed_rooms:
+            raise ScheduleInputError(
+                f"Немає жодної аудиторії типу '{subject_type}' для предмета '{lecture.subject}'.",
+                status="Помилка вхідних даних: немає аудиторії потрібного типу.",
+            )
+        lecture.allowed_starts = allowed_starts
+        lecture.allowed_rooms = allowed_rooms
+
+    # ------------------------- Спільний індекс змінних -------------------------
+    specs = []
+    var_offset = 0
+    lectures_by_group = defaultdict(list)
+    for lecture in lectures:
+        lectures_by_group[lecture.group].append(lecture)
+    # Глобальні індекси змінних занять: (лекція, номер заняття) -> (початок, аудиторія, перша "починається у слоті")
+    session_index = {}
+    for g in group_names:
+        sessions = []
+        var_count = 0
+        for lecture in lectures_by_group[g]:
+            for i in range(lecture.sessions):
+                start = var_offset + var_count
+                session_index[(id(lecture), i)] = (start, start + 1, start + 2)
+                sessions.append((lecture.duration, lecture.allowed_starts, lecture.allowed_rooms, lecture.week))
+                var_count += 2 + len(lecture.allowed_starts)
+        var_count += occupancy_var_count(slots_per_day, [lecture.week for lecture in lectures_by_group[g]])
+        specs.append({"kind": "group", "name": g, "var_offset": var_offset, "var_count": var_count,
+                      "sessions": sessions, "slots_per_day": slots_per_day})
+        var_offset += var_count
+
+    lectures_by_teacher = defaultdict(list)
+    for lecture in lectures:
+        lectures_by_teacher[lecture.teacher].append(lecture)
+    known_teachers = set(teacher_names)
+    for t in list(dict.fromkeys(teacher_names)) + [t for t in lectures_by_teacher if t not in known_teachers]:
+        sessions = []
+        for lecture in lectures_by_teacher[t]:
+            for i in range(lecture.sessions):
+                start, _, starts_base = session_index[(id(lecture), i)]
+                sessions.append((start, lecture.duration, lecture.allowed_starts, starts_base, lecture.week))
+        var_count = occupancy_var_count(slots_per_day, [lecture.week for lecture in lectures_by_teacher[t]]) if t in known_teachers else 0
+        specs.append({"kind": "teacher", "name": t, "var_offset": var_offset, "var_count": var_count,
+                      "sessions": sessions, "slots_per_day": slots_per_day})
+        var_offset += var_count
+
+    rooms_by_type = defaultdict(list)
+    for r in room_indices:
+        rooms_by_type[rooms[r].get("type", "")].append(r)
+    for room_type, type_rooms in rooms_by_type.items():
+        type_room_set = set(type_rooms)
+        sessions = []
+        var_count = 0
+        for lecture in lectures:
+            rooms_here = [r for r in lecture.allowed_rooms if r in type_room_set]
+            if not rooms_here:
+                continue
+            for i in range(lecture.sessions):
+                start, room_var, _ = session_index[(id(lecture), i)]
+                sessions.append((start, room_var, lecture.duration, lecture.allowed_rooms, rooms_here, lecture.week))
+                if len(lecture.allowed_rooms) > 1:
+                    var_count += len(rooms_here)
+        specs.append({"kind": "room_type", "name": room_type, "var_offset": var_offset, "var_count": var_count,
+                      "sessions": sessions, "unavailable": {r: sorted(room_unavailable[r]) for r in type_rooms}})
+        var_offset += var_count
+
+    # ------------------------- Побудова та злиття фрагментів -------------------------
+    if workers is None:
+        total_sessions = sum(lecture.sessions for lecture in lectures)
+        workers = (os.cpu_count() or 1) if total_sessions >= PARALLEL_BUILD_MIN_SESSIONS else 1
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            built = list(pool.map(build_fragment, specs, chunksize=max(1, len(specs) // (workers * 4))))
+    else:
+        # У власному процесі фрагменти зливаються напряму, без перетворення у текстовий формат
+        built = [build_fragment_proto(spec) for spec in specs]
+
+    model = cp_model.CpModel()
+    group_occupied = {}
+    teacher_occupied = {}
+    group_windows = {}
+    teacher_windows = {}
+    for spec, (fragment, no_overlaps, outputs) in zip(specs, built):
+        merge_fragment(model, fragment, no_overlaps, spec["var_offset"])
+        if not outputs:
+            continue
+        is_group = spec["kind"] == "group"
+        (group_occupied if is_group else teacher_occupied)[spec["name"]] = {
+            variant: [[model.GetBoolVarFromProtoIndex(idx) for idx in row] for row in rows]
+            for variant, rows in outputs["occupied"].items()}
+        (group_windows if is_group else teacher_windows)[spec["name"]] = {
+            variant: [model.GetBoolVarFromProtoIndex(idx) for idx in literals]
+            for variant, literals in outputs["windows"].items()}
+
+    for lecture in lectures:
+        lecture.vars = []
+        for i in range(lecture.sessions):
+            start, room_var, _ = session_index[(id(lecture), i)]
+            lecture.vars.append((model.GetIntVarFromProtoIndex(start), model.GetIntVarFromProtoIndex(room_var)))
+
+    return ScheduleModel(model, lectures, group_occupied, teacher_occupied, group_windows, teacher_windows)
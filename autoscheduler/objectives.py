@@ -0,0 +1,149 @@
+"""
+Ієрархічна (лексикографічна) оптимізація розкладу.
+
+Замість однієї зваженої суми цілі оптимізуються по черзі: значення, досягнуте на кожному етапі,
+фіксується обмеженням, а знайдене рішення передається наступному етапу як підказка.
+Кожен етап має власний ліміт часу та допустимий відносний розрив (relative_gap_limit),
+тож етап можна зупинити достроково, щойно розрив став меншим за заданий.
+"""
+import time
+
+from ortools.sat.python import cp_model
+
+from .data import DAYS
+
+# Етапи у порядку пріоритету
+OBJECTIVE_STAGES = ["group_windows", "teacher_windows", "worst_teacher_windows", "day_load"]
+# Етапи вікон визначають загальний статус (OPTIMAL/FEASIBLE). Рівномірність навантаження має слабку нижню межу
+# і практично ніколи не закриває розрив, тому її результат лише покращує розклад, але не впливає на статус.
+# Вона розв'язується лише після доведено оптимальних вікон і з невеликим лімітом часу: на data1 вікна
+# займають ~3 с, а етап навантаження за 2 с дає 49 (межа 30), за 10 с — 40.
+WINDOW_STAGES = ["group_windows", "teacher_windows", "worst_teacher_windows"]
+# Статус етапу, який не запускався
+SKIPPED = "SKIPPED"
+
+STAGE_TITLES = {
+    "group_windows": "Вікна груп",
+    "teacher_windows": "Вікна викладачів",
+    "worst_teacher_windows": "Найбільше вікон в одного викладача",
+    "day_load": "Навантаження за день (сума максимумів)",
+}
+
+# Ліміт часу (с, None — без обмеження) та допустимий відносний розрив для кожного етапу
+DEFAULT_STAGE_LIMITS = {
+    "group_windows": {"time_limit": None, "relative_gap": 0.0},
+    "teacher_windows": {"time_limit": None, "relative_gap": 0.0},
+    "worst_teacher_windows": {"time_limit": 30, "relative_gap": 0.0},
+    "day_load": {"time_limit": 2, "relative_gap": 0.05},
+}
+
+
+def build_objectives(schedule_model, slots_per_day):
+    """Створює вирази цілей для всіх етапів. Повертає {назва етапу: лінійний вираз}."""
+    model = schedule_model.model
+    objectives = {
+        "group_windows": _weighted_windows_sum(schedule_model, schedule_model.group_windows.values()),
+        "teacher_windows": _weighted_windows_sum(schedule_model, schedule_model.teacher_windows.values()),
+    }
+
+    # Найбільша кількість вікон в одного викладача (за два тижні, якщо є непарні/парні заняття)
+    worst_teacher_windows = model.NewIntVar(0, 2 * len(DAYS) * slots_per_day, "worst_teacher_windows")
+    for windows_by_variant in schedule_model.teacher_windows.values():
+        model.Add(worst_teacher_windows >= _weighted_windows_sum(schedule_model, [windows_by_variant]))
+    objectives["worst_teacher_windows"] = worst_teacher_windows
+
+    # Рівномірність навантаження: для кожної групи та викладача мінімізуємо найбільшу кількість пар за день
+    max_day_loads = []
+    for kind, occupied_by_name in (("group", schedule_model.group_occupied), ("teacher", schedule_model.teacher_occupied)):
+        for name, occupied_by_variant in occupied_by_name.items():
+            max_load = model.NewIntVar(0, slots_per_day, f"max_day_load_{kind}_{name}")
+            for occupied in occupied_by_variant.values():
+                for row in occupied:
+                    model.Add(max_load >= cp_model.LinearExpr.Sum(row))
+                # Максимум не менший за середнє навантаження — дає розв'язувачу сильнішу нижню межу
+                model.Add(len(occupied) * max_load >= cp_model.LinearExpr.Sum([lit for row in occupied for lit in row]))
+            max_day_loads.append(max_load)
+    objectives["day_load"] = cp_model.LinearExpr.Sum(max_day_loads)
+    return objectives
+
+
+def _weighted_windows_sum(schedule_model, windows_by_entity):
+    """Зважена сума вікон сутностей (кожна — {варіант тижня: літерали})."""
+    literals, weights = [], []
+    for windows_by_variant in windows_by_entity:
+        entity_literals, entity_weights = schedule_model.weighted_windows(windows_by_variant)
+        literals.extend(entity_literals)
+        weights.extend(entity_weights)
+    return cp_model.LinearExpr.WeightedSum(literals, weights)
+
+
+def stage_limits_with_defaults(stage_limits):
+    """Доповнює задані користувачем ліміти етапів значеннями за замовчуванням."""
+    limits = {}
+    for stage in OBJECTIVE_STAGES:
+        limits[stage] = dict(DEFAULT_STAGE_LIMITS[stage])
+        limits[stage].update((stage_limits or {}).get(stage, {}))
+    return limits
+
+
+def _hint_solution(model, solution):
+    """Замінює підказки моделі повним попереднім рішенням."""
+    model.ClearHints()
+    hint = model.Proto().solution_hint
+    hint.vars.extend(range(len(solution)))
+    hint.values.extend(solution)
+
+
+def solve_lexicographic(solver, model, objectives, stage_limits=None, time_limit=None, callback=None):
+    """
+    Розв'язує етапи OBJECTIVE_STAGES по черзі.
+    time_limit — загальний ліміт часу на всі етапи; ліміт етапу не може перевищувати залишок.
+    Повертає (статус, рішення, результати етапів), де рішення — значення всіх змінних моделі
+    з останнього успішного етапу (або None), а статус — OPTIMAL лише якщо всі етапи WINDOW_STAGES доведено оптимальні.
+    Якщо етап не знайшов рішення за свій ліміт, зберігається рішення попереднього етапу.
+    Етапи поза WINDOW_STAGES пропускаються (статус SKIPPED), якщо вікна не доведено оптимальними.
+    """
+    limits = stage_limits_with_defaults(stage_limits)
+    # Ліміт часу з профілю параметрів діє для етапів без власного ліміту
+    base_time_limit = solver.parameters.max_time_in_seconds
+    deadline = None if time_limit is None else time.monotonic() + float(time_limit)
+    solution = None
+    overall_status = cp_model.OPTIMAL
+    stage_results = []
+    for stage in OBJECTIVE_STAGES:
+        if stage not in WINDOW_STAGES and overall_status != cp_model.OPTIMAL:
+            # Час вичерпано на вікнах — покращувати рівномірність поверх недоведеного рішення не варто
+            stage_results.append({"stage": stage, "status": SKIPPED, "value": None, "best_bound": None, "wall_time": 0.0})
+            continue
+        stage_time_limit = limits[stage]["time_limit"]
+        if deadline is not None:
+            remaining = max(0.0, deadline - time.monotonic())
+            stage_time_limit = remaining if stage_time_limit is None else min(stage_time_limit, remaining)
+        solver.parameters.max_time_in_seconds = base_time_limit if stage_time_limit is None else float(stage_time_limit)
+        solver.parameters.relative_gap_limit = float(limits[stage]["relative_gap"])
+
+        objective = objectives[stage]
+        model.Minimize(objective)
+        if callback is not None:
+            callback.stage = stage
+        status = solver.Solve(model, callback)
+
+        if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            value = int(round(solver.ObjectiveValue()))
+            solution = list(solver.ResponseProto().solution)
+            stage_results.append({"stage": stage, "status": solver.StatusName(status), "value": value,
+                                  "best_bound": solver.BestObjectiveBound(), "wall_time": solver.WallTime()})
+            if status == cp_model.FEASIBLE and stage in WINDOW_STAGES:
+                overall_status = cp_model.FEASIBLE
+            # Фіксуємо досягнуте значення та передаємо рішення наступному етапу як підказку
+            model.Add(objective <= value)
+            _hint_solution(model, solution)
+        elif solution is None:
+            # Перший етап без рішення: задача недопустима або не розв'язана за відведений час
+            return status, None, stage_results
+        else:
+            stage_results.append({"stage": stage, "status": solver.StatusName(status), "value": None,
+                                  "best_bound": None, "wall_time": solver.WallTime()})
+            if stage in WINDOW_STAGES:
+                overall_status = cp_model.FEASIBLE
+    return overall_status, solution, stage_results
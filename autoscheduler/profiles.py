@@ -0,0 +1,30 @@
+"""Профілі параметрів CP-SAT для різних класів розміру задачі."""
+import json
+import os
+
+from ortools.sat.python import cp_model
+
+# Файл з найкращими профілями параметрів CP-SAT для кожного класу розміру задачі (створюється autoscheduler.tuning)
+SOLVER_PROFILES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "solver_profiles.json")
+# Межі класів розміру задачі за загальною кількістю пар на тиждень
+SIZE_CLASSES = [("small", 100), ("medium", 1000), ("large", None)]
+
+def size_class(total_lessons):
+    """Повертає назву класу розміру задачі за загальною кількістю пар на тиждень."""
+    for name, limit in SIZE_CLASSES:
+        if limit is None or total_lessons <= limit:
+            return name
+
+def load_solver_profile(instance_size_class, path=SOLVER_PROFILES_PATH):
+    """Повертає збережений профіль параметрів для класу розміру або None, якщо його немає."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get(instance_size_class, {}).get("params")
+
+def apply_solver_params(solver, params):
+    """Записує словник параметрів у solver.parameters (search_branching задається назвою, напр. "FIXED_SEARCH")."""
+    for key, value in params.items():
+        if key == "search_branching":
+            value = getattr(cp_model, value)
+        setattr(solver.parameters, key, value)
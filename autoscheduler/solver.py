@@ -0,0 +1,319 @@
+"""Побудова моделі CP-SAT, розв'язання та формування звіту про розклад."""
+import math
+import os
+from collections import defaultdict
+
+from ortools.sat.python import cp_model
+
+from .checkpoint import CHECKPOINT_FILENAME, CheckpointCallback, input_fingerprint, load_checkpoint
+from .data import DAYS, INPUT_FILES, WEEK_TITLES, create_lectures, parse_slots_per_day, parse_unavailable_slots
+from .diff import diff_solutions
+from .errors import ScheduleInputError
+from .export import export_excel, export_folder_path, load_previous_solution, write_changes_manifest, write_solution_json
+from .loader import load_inputs
+from .model_builder import build_schedule_model
+from .objectives import OBJECTIVE_STAGES, SKIPPED, STAGE_TITLES, build_objectives, solve_lexicographic
+from .profiles import apply_solver_params, load_solver_profile, size_class
+from .validator import validate_schedule
+
+
+def run_solver_and_generate_reports(data_folder, strategy_choice, user_slots_per_day,
+                                    solver_params=None, time_limit=None, export=True, run_info=None,
+                                    resume=False, build_workers=None, stage_limits=None):
+    """
+    Запускає CP-SAT розв'язувач для генерації розкладу
+    та повертає дані розкладу для відображення та збереження.
+
+    strategy_choice "auto" застосовує збережений профіль для класу розміру задачі,
+    а solver_params (якщо задано) перевизначає будь-яку стратегію.
+    Якщо передано словник run_info, у нього записуються статус, час розв'язання та значення цілі.
+    Під час експорту найкраще рішення періодично зберігається у export/checkpoint.json;
+    resume=True використовує його як підказку та межі цілі для продовження розв'язання.
+    build_workers задає кількість процесів для побудови моделі (None — автоматично за розміром задачі).
+    Цілі оптимізуються лексикографічно (див. autoscheduler.objectives); stage_limits перевизначає
+    ліміт часу та допустимий розрив окремих етапів, а time_limit обмежує загальний час усіх етапів.
+    Помилки вхідних даних піднімаються як ScheduleInputError (без GUI-повідомлень).
+    """
+    # Оновлення констант на основі вводу користувача
+    SLOTS_PER_DAY = parse_slots_per_day(user_slots_per_day)
+
+    TOTAL_SLOTS = len(DAYS) * SLOTS_PER_DAY
+
+    # Завантаження даних з файлів (відсутні чи пошкоджені файли — ScheduleInputError)
+    groups, teachers, subjects, rooms = load_inputs(data_folder)
+
+    # Створення словника для швидкого доступу до типів предметів
+    subject_types = {s["name"]: s.get("type", "") for s in subjects}
+
+    # Недоступні слоти викладачів та аудиторій (необов'язкове поле "unavailable")
+    try:
+        teacher_unavailable = {t["name"]: parse_unavailable_slots(t.get("unavailable"), SLOTS_PER_DAY) for t in teachers}
+        room_unavailable = [parse_unavailable_slots(r.get("unavailable"), SLOTS_PER_DAY) for r in rooms]
+    except ValueError as e:
+        raise ScheduleInputError(str(e))
+
+    # ------------------------- Модель розкладу -------------------------
+    # Створення об'єктів Lecture на основі вхідних даних
+    lectures = create_lectures(groups, TOTAL_SLOTS)
+
+    group_names = [group["name"] for group in groups]
+    teacher_names = [teacher["name"] for teacher in teachers]
+
+    # Змінні занять, жорсткі обмеження (NoOverlap груп, викладачів, аудиторій) та змінні вікон.
+    # Модель будується фрагментами по групах, викладачах і типах аудиторій — для великих задач паралельно.
+    schedule_model = build_schedule_model(lectures, group_names, teacher_names, rooms, subject_types,
+                                          teacher_unavailable, room_unavailable, SLOTS_PER_DAY, workers=build_workers)
+    model = schedule_model.model
+    # group_day_slot_occupied[group_name][day_index][slot_in_day_index]
+    group_day_slot_occupied = schedule_model.group_occupied
+    # teacher_day_slot_occupied[teacher_name][day_index][slot_in_day_index]
+    teacher_day_slot_occupied = schedule_model.teacher_occupied
+
+    # --- М'які обмеження: цілі ієрархічної оптимізації ---
+    # Вікна груп, вікна викладачів, найгірший викладач та рівномірність навантаження — по черзі, а не зваженою сумою
+    objectives = build_objectives(schedule_model, SLOTS_PER_DAY)
+
+    # ------------------------- Розв’язання -------------------------
+    solver = cp_model.CpSolver()
+    instance_size_class = size_class(sum(lec.count for lec in lectures))
+    if strategy_choice == "auto" and solver_params is None:
+        solver_params = load_solver_profile(instance_size_class)
+        if solver_params is None:
+            # Профіль ще не налаштовано — поводимося як стратегія за замовчуванням
+            strategy_choice = "default"
+    # Налаштування стратегії пошуку за аргументом командного рядка
+    if solver_params is not None:
+        apply_solver_params(solver, solver_params)
+    elif strategy_choice == "random":
+        solver.parameters.random_seed = 42
+        solver.parameters.search_branching = cp_model.PORTFOLIO_SEARCH
+    elif strategy_choice == "default":
+        # Явна установка default, хоча це і так поведінка за замовчуванням
+        solver.parameters.search_branching = cp_model.FIXED_SEARCH
+
+    # Контрольні точки: збереження проміжних рішень та відновлення з них
+    checkpoint_callback = None
+    if export:
+        checkpoint_path = os.path.join(export_folder_path(), CHECKPOINT_FILENAME)
+        os.makedirs(os.path.dirname(checkpoint_path), exist_ok=True)
+        fingerprint = input_fingerprint(data_folder, INPUT_FILES, SLOTS_PER_DAY)
+        # Ключ містить індекс лекції: група може мати той самий предмет кількома записами (лекція та практика)
+        lecture_vars = [(f"{lec_idx}|{lec.group}|{lec.subject}|{i}", slot, room)
+                        for lec_idx, lec in enumerate(lectures) for i, (slot, room) in enumerate(lec.vars)]
+        if resume:
+            checkpoint = load_checkpoint(checkpoint_path, fingerprint)
+            if checkpoint is not None:
+                for key, slot, room in lecture_vars:
+                    if key in checkpoint["assignments"]:
+                        slot_value, room_value = checkpoint["assignments"][key]
+                        model.AddHint(slot, slot_value)
+                        model.AddHint(room, room_value)
+                # Відомі межі цілі першого етапу: гірше за збережене рішення шукати не потрібно, а краще за доведену межу неможливо.
+                # Межі пізніших етапів дійсні лише за зафіксованими значеннями попередніх, тому для них використовуються лише підказки.
+                if checkpoint.get("stage") == OBJECTIVE_STAGES[0]:
+                    first_objective = objectives[OBJECTIVE_STAGES[0]]
+                    model.Add(first_objective <= int(round(checkpoint["objective"])))
+                    model.Add(first_objective >= math.ceil(checkpoint["best_bound"] - 1e-6))
+        checkpoint_callback = CheckpointCallback(checkpoint_path, fingerprint, lecture_vars)
+
+    # Запуск розв'язувача: етапи по черзі, кожен зі своїм лімітом часу та допустимим розривом
+    status, solution, stage_results = solve_lexicographic(solver, model, objectives, stage_limits, time_limit, checkpoint_callback)
+
+    if checkpoint_callback is not None:
+        checkpoint_callback.stop()
+        if status == cp_model.OPTIMAL:
+            # Усі етапи вікон доведено оптимальні — продовжувати нічого, контрольна точка більше не потрібна
+            if os.path.exists(checkpoint_callback.path):
+                os.remove(checkpoint_callback.path)
+        else:
+            # Зупинка за лімітом часу — зберігаємо останнє рішення для наступного запуску з resume
+            solved_stages = [result for result in stage_results if result["value"] is not None]
+            if solved_stages:
+                checkpoint_callback.save(solution, solved_stages[-1])
+
+    if run_info is not None:
+        run_info["status"] = solver.StatusName(status)
+        run_info["wall_time"] = sum(result["wall_time"] for result in stage_results) or solver.WallTime()
+        run_info["size_class"] = instance_size_class
+        # Загальна кількість вікон (групи та викладачі) у знайденому рішенні — для порівняння запусків.
+        # Рахується за самим рішенням: етап, якому забракло часу, не має власного значення цілі.
+        run_info["objective"] = schedule_model.total_windows(solution) if solution is not None else None
+        run_info["stages"] = stage_results
+
+    # ------------------------- Обробка результатів -------------------------
+    if solution is not None:
+        def value(var):
+            """Значення змінної в останньому знайденому рішенні."""
+            return solution[var.Index()]
+
+        # Словники для зберігання розкладу для груп та викладачів
+        timetable = defaultdict(lambda: defaultdict(list))
+        timetable_teachers = defaultdict(lambda: defaultdict(list))
+        # Плоский список занять — канонічне представлення рішення для перевірки та solution.json
+        lessons = []
+
+        for lec in lectures:
+            for i, (slot, room) in enumerate(lec.vars):
+                time_slot = value(slot)
+                day_index = time_slot // SLOTS_PER_DAY
+                day = DAYS[day_index]
+                room_name = rooms[value(room)]["name"]
+
+                # Здвоєне заняття займає duration пар поспіль в одній аудиторії
+                for k in range(lec.duration):
+                    pair = time_slot % SLOTS_PER_DAY + 1 + k
+                    # Зберігаємо окремі компоненти даних
+                    timetable[lec.group][day].append((pair, lec.subject, lec.teacher, room_name, lec.week))
+                    timetable_teachers[lec.teacher][day].append((pair, lec.subject, lec.group, room_name, lec.week))
+                    lessons.append({"group": lec.group, "subject": lec.subject, "teacher": lec.teacher,
+                                    "room": room_name, "day": day, "pair": pair, "week": lec.week})
+
+        # Незалежна перевірка рішення перед експортом: некоректний розклад не записується
+        validation_errors, validated_windows = validate_schedule(lessons, groups, teachers, subjects, rooms, SLOTS_PER_DAY)
+        export_folder = export_folder_path()
+        if validation_errors:
+            validation_report_text = "❌ Розклад не пройшов перевірку:\n" + "\n".join(validation_errors)
+            if export:
+                os.makedirs(export_folder, exist_ok=True)
+                with open(os.path.join(export_folder, "validation_report.txt"), "w", encoding="utf-8") as f:
+                    f.write(validation_report_text)
+            return None, None, validation_report_text, "❌ Розклад не пройшов перевірку. Дивіться 'export/validation_report.txt'"
+
+        changes = None
+        if export:
+            # Створення директорії для експорту, якщо вона не існує
+            os.makedirs(export_folder, exist_ok=True)
+            # Інкрементний експорт: порівнюємо з попереднім рішенням і перезаписуємо лише змінені аркуші
+            previous_lessons = load_previous_solution(export_folder, SLOTS_PER_DAY)
+            if previous_lessons is not None:
+                changes = diff_solutions(previous_lessons, lessons)
+            write_changes_manifest(export_folder, changes)
+            export_excel(export_folder, timetable, timetable_teachers, changes)
+            write_solution_json(export_folder, lessons, SLOTS_PER_DAY)
+
+        # Формування детального звіту про вікна
+        report_text = ["\n--- Детальний звіт про вікна ---"]
+        calculated_windows_count_debugger = 0
+
+        # Звіт для груп
+        for g in group_names:
+            # Окремо для непарного та парного тижня, якщо у сутності є заняття лише одного з них
+            for week, occupied in group_day_slot_occupied[g].items():
+                entity = g if week == "weekly" else f"{g} ({WEEK_TITLES[week]})"
+                for d_idx, day in enumerate(DAYS):
+                    occupied_slots_representation = []
+                    for s_idx in range(SLOTS_PER_DAY):
+                        if value(occupied[d_idx][s_idx]):
+                            occupied_slots_representation.append("X")
+                        else:
+                            occupied_slots_representation.append("O")
+                
+                    first_occupied = -1
+                    last_occupied = -1
+                    for i, slot_state in enumerate(occupied_slots_representation):
+                        if slot_state == "X":
+                            if first_occupied == -1:
+                                first_occupied = i
+                            last_occupied = i
+                
+                    windows_for_this_day = 0
+                    if first_occupied != -1:
+                        for s_idx in range(first_occupied + 1, last_occupied):
+                            if occupied_slots_representation[s_idx] == "O":
+                                windows_for_this_day += 1
+                                calculated_windows_count_debugger += schedule_model.window_weight(week)
+                        report_text.append(f"Група {entity}, {day}: {windows_for_this_day} вікон. Розклад: {''.join(occupied_slots_representation)}")
+                    else:
+                        report_text.append(f"Група {entity}, {day}: Немає занять.")
+
+        # Звіт для викладачів
+        for t in teacher_names:
+            # Окремо для непарного та парного тижня, якщо у сутності є заняття лише одного з них
+            for week, occupied in teacher_day_slot_occupied[t].items():
+                entity = t if week == "weekly" else f"{t} ({WEEK_TITLES[week]})"
+                for d_idx, day in enumerate(DAYS):
+                    occupied_slots_representation = []
+                    for s_idx in range(SLOTS_PER_DAY):
+                        if value(occupied[d_idx][s_idx]):
+                            occupied_slots_representation.append("X")
+                        else:
+                            occupied_slots_representation.append("O")
+                
+                    first_occupied = -1
+                    last_occupied = -1
+                    for i, slot_state in enumerate(occupied_slots_representation):
+                        if slot_state == "X":
+                            if first_occupied == -1:
+                                first_occupied = i
+                            last_occupied = i
+                
+                    windows_for_this_day = 0
+                    if first_occupied != -1:
+                        for s_idx in range(first_occupied + 1, last_occupied):
+                            if occupied_slots_representation[s_idx] == "O":
+                                windows_for_this_day += 1
+                                calculated_windows_count_debugger += schedule_model.window_weight(week)
+                        report_text.append(f"Викладач {entity}, {day}: {windows_for_this_day} вікон. Розклад: {''.join(occupied_slots_representation)}")
+                    else:
+                        report_text.append(f"Викладач {entity}, {day}: Немає занять.")
+        
+        total_windows = schedule_model.total_windows(solution)
+        report_text.append(f"\n📊 Загальна кількість вікон у розкладі (за моделлю): {total_windows}")
+        report_text.append(f"Підраховано вікон (для перевірки у звіті): {calculated_windows_count_debugger}")
+        report_text.append(f"Вікон за незалежною перевіркою розкладу: {validated_windows}")
+        if changes is not None:
+            report_text.append(f"Змінено розклад порівняно з попереднім: груп — {len(changes['groups'])}, викладачів — {len(changes['teachers'])} (див. export/changes.json)")
+
+        # Результати етапів ієрархічної оптимізації
+        report_text.append("\n--- Етапи оптимізації ---")
+        for result in stage_results:
+            if result["status"] == SKIPPED:
+                report_text.append(f"{STAGE_TITLES[result['stage']]}: етап пропущено (вікна не доведено оптимальними)")
+            elif result["value"] is None:
+                report_text.append(f"{STAGE_TITLES[result['stage']]}: рішення не покращено ({result['status']}, {result['wall_time']:.1f} с)")
+            else:
+                report_text.append(f"{STAGE_TITLES[result['stage']]}: {result['value']} ({result['status']}, межа {result['best_bound']:.0f}, {result['wall_time']:.1f} с)")
+
+        if status != cp_model.OPTIMAL:
+            report_text.append(f"\n💡 Знайдено допустиме рішення (не всі етапи вікон доведено оптимальними). Вікон: {total_windows}.")
+        elif total_windows == 0:
+            report_text.append("\n🎉 Оптимальне рішення знайдено: розклад не містить вікон між заняттями.")
+        else:
+            report_text.append(f"\n💡 Оптимальне рішення знайдено. Залишилося {total_windows} вікон, яких неможливо уникнути через жорсткі обмеження.")
+        
+        return timetable, timetable_teachers, "\n".join(report_text), "Розклад успішно згенеровано!"
+
+    elif status == cp_model.UNKNOWN:
+        # Ліміт часу вичерпано до першого допустимого рішення — це не доводить, що вхідні дані суперечливі
+        timeout_report_text = (
+            "⏱ Ліміт часу вичерпано до того, як знайдено перше допустиме рішення.\n"
+            "Розв'язувач не довів, що розкладу не існує, тож шукати помилки у вхідних даних не обов'язково.\n\n"
+            "📌 Що можна зробити:\n"
+            "- Збільшити ліміт часу (time_limit або max_time_in_seconds у профілі параметрів)\n"
+            "- Продовжити розв'язання з контрольної точки (resume)\n"
+            "- Спробувати іншу стратегію пошуку\n"
+        )
+        if export:
+            export_folder = export_folder_path()
+            os.makedirs(export_folder, exist_ok=True)
+            with open(os.path.join(export_folder, "timeout_report.txt"), "w", encoding="utf-8") as f:
+                f.write(timeout_report_text)
+        return None, None, timeout_report_text, "⏱ Ліміт часу вичерпано до першого рішення. Дивіться 'export/timeout_report.txt'"
+
+    else:
+        # Випадок, коли рішення не знайдено: задачу доведено недопустимою
+        conflict_report_text = (
+            "❌ Не вдалося знайти допустиме рішення. Перевірте конфлікти у вхідних даних.\n\n"
+            "📌 Можливі причини:\n"
+            "- Група перевантажена (занадто багато пар на тиждень)\n"
+            "- Аудиторій недостатньо або неправильного типу\n"
+            "- Один викладач закріплений за занадто багатьма групами\n"
+            "- Всі групи мають пари одночасно, а кімнат не вистачає\n"
+            "\n🔎 Перевірте файли у папці data/: groups.json, teachers.json, rooms.json, subjects.json\n"
+        )
+        if export:
+            export_folder = export_folder_path()
+            os.makedirs(export_folder, exist_ok=True)
+            with open(os.path.join(export_folder, "conflict_report.txt"), "w", encoding="utf-8") as f:
+                f.write(conflict_report_text)
+        return None, None, conflict_report_text, "❌ Не вдалося знайти допустиме рішення. Дивіться 'export/conflict_report.txt'"
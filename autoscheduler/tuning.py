@@ -0,0 +1,128 @@
+"""
+Підбір параметрів CP-SAT для розкладу.
+
+Запускає пошук по сітці (або випадковий пошук) параметрів розв'язувача на наборі
+тестових папок з даними з кількома seed-ами і зберігає найкращий профіль для кожного
+класу розміру задачі у solver_profiles.json. Стратегія "auto" у autoscheduler.solver
+автоматично застосовує ці профілі.
+
+Приклад:
+    python -m autoscheduler tune data1 data2 --seeds 3 --time-limit 30
+    python -m autoscheduler tune data1 --mode random --trials 20
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import statistics
+from collections import defaultdict
+
+from .data import DEFAULT_SLOTS_PER_DAY
+from .errors import ScheduleInputError
+from .profiles import SOLVER_PROFILES_PATH
+from .solver import run_solver_and_generate_reports
+
+# Простір пошуку параметрів CP-SAT
+PARAM_GRID = {
+    "num_workers": [1, 4, 8],
+    "search_branching": ["AUTOMATIC_SEARCH", "FIXED_SEARCH", "PORTFOLIO_SEARCH"],
+    "linearization_level": [0, 1, 2],
+    "symmetry_level": [0, 2],
+    "cp_model_presolve": [True, False],
+}
+
+# Профілі оцінюються за цілями вікон, тому етап рівномірності навантаження під час підбору не розв'язується
+TUNING_STAGE_LIMITS = {"day_load": {"time_limit": 0}}
+
+
+def grid_configs(grid=PARAM_GRID):
+    """Повертає всі комбінації параметрів із сітки."""
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def random_configs(trials, grid=PARAM_GRID, seed=0):
+    """Повертає trials випадкових (без повторів) комбінацій параметрів із сітки."""
+    configs = grid_configs(grid)
+    rng = random.Random(seed)
+    return rng.sample(configs, min(trials, len(configs)))
+
+
+def score_runs(runs, time_limit):
+    """
+    Оцінка конфігурації (менше — краще): спочатку кількість запусків без доведеного оптимуму вікон,
+    потім середня кількість вікон, потім середній час. Запуски без рішення штрафуються.
+    """
+    not_optimal = sum(1 for r in runs if r["status"] != "OPTIMAL")
+    objectives = [r["objective"] if r["objective"] is not None else float("inf") for r in runs]
+    times = [r["wall_time"] if r["objective"] is not None else 2 * time_limit for r in runs]
+    return (not_optimal, statistics.mean(objectives), statistics.mean(times))
+
+
+def tune(instances, configs, seeds, time_limit, slots_per_day=DEFAULT_SLOTS_PER_DAY):
+    """
+    Запускає кожну конфігурацію на кожній папці з даними для кожного seed
+    і повертає найкращий профіль для кожного класу розміру задачі.
+    """
+    # results[size_class][індекс конфігурації] -> список результатів запусків
+    results = defaultdict(lambda: defaultdict(list))
+    for config_idx, config in enumerate(configs):
+        for instance in instances:
+            for seed in range(seeds):
+                run_info = {}
+                params = dict(config, random_seed=seed)
+                try:
+                    run_solver_and_generate_reports(instance, "auto", slots_per_day, solver_params=params,
+                                                    time_limit=time_limit, export=False, run_info=run_info,
+                                                    stage_limits=TUNING_STAGE_LIMITS)
+                except ScheduleInputError as e:
+                    # Помилка вхідних даних — розв'язувач не запускався
+                    print(f"{instance}: {e.status}")
+                    continue
+                results[run_info["size_class"]][config_idx].append(run_info)
+                print(f"[{config_idx + 1}/{len(configs)}] {instance} seed={seed}: "
+                      f"{run_info['status']} obj={run_info['objective']} t={run_info['wall_time']:.2f}s")
+
+    profiles = {}
+    for instance_size_class, by_config in results.items():
+        best_idx = min(by_config, key=lambda idx: score_runs(by_config[idx], time_limit))
+        not_optimal, objective, wall_time = score_runs(by_config[best_idx], time_limit)
+        profiles[instance_size_class] = {
+            "params": configs[best_idx],
+            "mean_wall_time": wall_time,
+            "mean_objective": objective,
+            "not_optimal_runs": not_optimal,
+            "runs": len(by_config[best_idx]),
+        }
+    return profiles
+
+
+def save_profiles(profiles, path=SOLVER_PROFILES_PATH):
+    """Оновлює файл профілів, зберігаючи профілі класів розміру, які не налаштовувались цього разу."""
+    existing = {}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            existing = json.load(f)
+    existing.update(profiles)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(existing, f, ensure_ascii=False, indent=4)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Підбір параметрів CP-SAT для генерації розкладу.")
+    parser.add_argument("instances", nargs="+", help="Папки з groups.json, teachers.json, subjects.json, rooms.json")
+    parser.add_argument("--mode", choices=["grid", "random"], default="grid", help="Пошук по сітці або випадковий пошук")
+    parser.add_argument("--trials", type=int, default=20, help="Кількість конфігурацій для випадкового пошуку")
+    parser.add_argument("--seeds", type=int, default=3, help="Кількість повторів з різними random_seed")
+    parser.add_argument("--time-limit", type=float, default=30.0, help="Ліміт часу на один запуск, с")
+    parser.add_argument("--slots-per-day", type=int, default=DEFAULT_SLOTS_PER_DAY, help="Кількість пар на день")
+    parser.add_argument("--output", default=SOLVER_PROFILES_PATH, help="Файл для збереження профілів")
+    args = parser.parse_args(argv)
+
+    configs = grid_configs() if args.mode == "grid" else random_configs(args.trials)
+    profiles = tune(args.instances, configs, args.seeds, args.time_limit, args.slots_per_day)
+    save_profiles(profiles, args.output)
+    for instance_size_class, profile in profiles.items():
+        print(f"{instance_size_class}: {profile['params']} (середній час {profile['mean_wall_time']:.2f}s)")
+    print(f"Профілі збережено у {args.output}")
@@ -0,0 +1,199 @@
+"""
+Незалежна перевірка розкладу.
+
+Перевіряє готовий розклад (export/solution.json або export/schedule.xlsx) на відповідність
+вхідним JSON-файлам за лінійний час: накладки груп, викладачів і аудиторій, відповідність
+типу аудиторії, точну кількість годин кожного предмета, межі пар на день, недоступні
+слоти, цілісність здвоєних занять, тижневі шаблони (непарний/парний тиждень), а також перераховує кількість вікон. Зайнятість слотів зберігається бітовими масками
+по (сутність, день), тому кожне заняття перевіряється за O(1).
+
+Приклад:
+    python -m autoscheduler validate data1 export/schedule.xlsx --slots-per-day 5
+"""
+import argparse
+import json
+from collections import Counter, defaultdict
+
+from .data import DAYS, DEFAULT_SLOTS_PER_DAY, WEEK_TITLES, occurs_in, parse_unavailable_slots
+from .loader import load_inputs
+
+
+def load_solution(path, groups):
+    """
+    Завантажує розклад як список занять {"group", "subject", "teacher", "room", "day", "pair", "week"}.
+    Підтримує solution.json, що зберігається під час експорту, та schedule.xlsx (аркуш на групу).
+    Аркуш з колонкою "Тиждень" містить окремо непарний і парний тиждень: щотижневі заняття
+    (за навчальним планом) беруться з непарного, а заняття непарного/парного тижня — зі свого варіанта.
+    """
+    if path.endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            solution = json.load(f)
+        return solution["lessons"] if isinstance(solution, dict) else solution
+
+    from openpyxl import load_workbook
+    # Назви аркушів обрізані до 31 символу — відновлюємо повні назви груп
+    group_by_title = {g["name"][:31]: g["name"] for g in groups}
+    planned_weeks = defaultdict(set)
+    for g in groups:
+        for subj in g["subjects"]:
+            planned_weeks[(g["name"], subj["name"], subj["teacher"])].add(subj.get("week", "weekly"))
+    week_by_title = {title: week for week, title in WEEK_TITLES.items()}
+    workbook = load_workbook(path, read_only=True)
+    lessons = []
+    for ws in workbook.worksheets:
+        group = group_by_title.get(ws.title, ws.title)
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        with_weeks = bool(header) and header[0] == "Тиждень"
+        for row in rows:
+            if not row or row[0] is None:
+                continue
+            week = "weekly"
+            if with_weeks:
+                variant, row = week_by_title.get(row[0], row[0]), row[1:]
+                if planned_weeks.get((group, row[2], row[3]), {"weekly"}) == {"weekly"}:
+                    # Щотижневе заняття повторюється в обох варіантах — беремо його один раз
+                    if variant != "odd":
+                        continue
+                else:
+                    week = variant
+            day, pair, subject, teacher, room = row[:5]
+            lessons.append({"group": group, "subject": subject, "teacher": teacher,
+                            "room": room, "day": day, "pair": int(pair), "week": week})
+    workbook.close()
+    return lessons
+
+
+def count_windows(mask):
+    """Кількість вільних пар між першою та останньою зайнятою парою дня."""
+    if not mask:
+        return 0
+    lowest = (mask & -mask).bit_length() - 1
+    span = mask.bit_length() - lowest
+    return span - bin(mask).count("1")
+
+
+def consecutive_runs(mask):
+    """Довжини блоків зайнятих пар поспіль у масці дня."""
+    runs = []
+    while mask:
+        mask >>= (mask & -mask).bit_length() - 1
+        run = (~mask & (mask + 1)).bit_length() - 1
+        runs.append(run)
+        mask >>= run
+    return runs
+
+
+def validate_schedule(lessons, groups, teachers, subjects, rooms, slots_per_day):
+    """
+    Перевіряє розклад і повертає (errors, windows), де errors — список описів порушень,
+    а windows — загальна кількість вікон груп і викладачів. Якщо в навчальному плані є заняття
+    лише непарного чи парного тижня, накладки перевіряються окремо для кожного тижня,
+    а вікна рахуються за обидва тижні.
+    """
+    errors = []
+    subject_types = {s["name"]: s.get("type", "") for s in subjects}
+    room_types = {r["name"]: r.get("type", "") for r in rooms}
+    teacher_unavailable = {t["name"]: parse_unavailable_slots(t.get("unavailable"), slots_per_day) for t in teachers}
+    room_unavailable = {r["name"]: parse_unavailable_slots(r.get("unavailable"), slots_per_day) for r in rooms}
+    # Очікувані (група, предмет, викладач, тижневий шаблон) -> [години, тривалість заняття].
+    # Група може мати той самий предмет кількома записами (наприклад, лекція та практика з різними викладачами):
+    # години таких записів сумуються, а за різної тривалості блоки пар не перевіряються (тривалість 1).
+    expected = {}
+    planned_teachers = defaultdict(set)
+    for group in groups:
+        for subj in group["subjects"]:
+            week = subj.get("week", "weekly")
+            key = (group["name"], subj["name"], subj["teacher"], week)
+            duration = subj.get("duration", 1)
+            if key in expected:
+                expected[key][0] += subj["hours"]
+                if expected[key][1] != duration:
+                    expected[key][1] = 1
+            else:
+                expected[key] = [subj["hours"], duration]
+            planned_teachers[(group["name"], subj["name"])].add(subj["teacher"])
+    has_week_patterns = any(week != "weekly" for (_, _, _, week) in expected)
+
+    # Бітові маски зайнятості: (вид, назва, день, варіант тижня) -> маска пар
+    occupied = defaultdict(int)
+    # Маски пар кожного предмета групи по днях — для перевірки здвоєних занять
+    subject_masks = defaultdict(int)
+    hours = Counter()
+    for lesson in lessons:
+        group, subject, teacher, room = lesson["group"], lesson["subject"], lesson["teacher"], lesson["room"]
+        day, pair, week = lesson["day"], lesson["pair"], lesson.get("week", "weekly")
+        where = f"{group}, {subject}, {day} пара {pair}" + ("" if week == "weekly" else f" ({WEEK_TITLES.get(week, week)})")
+        if day not in DAYS:
+            errors.append(f"Невідомий день: {where}")
+            continue
+        if not 1 <= pair <= slots_per_day:
+            errors.append(f"Пара поза межами дня (1..{slots_per_day}): {where}")
+            continue
+        plan_key = (group, subject, teacher, week)
+        hours[plan_key] += 1
+
+        if (group, subject) not in planned_teachers:
+            errors.append(f"Предмет відсутній у навчальному плані групи: {where}")
+        elif teacher not in planned_teachers[(group, subject)]:
+            expected_teachers = "', '".join(sorted(planned_teachers[(group, subject)]))
+            errors.append(f"Неправильний викладач '{teacher}' (очікується '{expected_teachers}'): {where}")
+        elif plan_key not in expected:
+            planned_weeks = "', '".join(sorted(w for (g, s, t, w) in expected if (g, s, t) == (group, subject, teacher)))
+            errors.append(f"Тижневий шаблон '{week}' не відповідає навчальному плану ('{planned_weeks}'): {where}")
+        if room not in room_types:
+            errors.append(f"Невідома аудиторія '{room}': {where}")
+        elif subject_types.get(subject, "") not in ("", room_types[room]):
+            errors.append(f"Тип аудиторії '{room}' ({room_types[room]}) не відповідає типу предмета ({subject_types[subject]}): {where}")
+
+        global_slot = DAYS.index(day) * slots_per_day + pair - 1
+        if global_slot in teacher_unavailable.get(teacher, ()):
+            errors.append(f"Викладач '{teacher}' недоступний: {where}")
+        if global_slot in room_unavailable.get(room, ()):
+            errors.append(f"Аудиторія '{room}' недоступна: {where}")
+
+        bit = 1 << (pair - 1)
+        # Щотижневе заняття займає слот в обох тижнях, непарне/парне — лише у своєму
+        variants = [variant for variant in ("odd", "even") if occurs_in(week, variant)]
+        for kind, name, label in (("group", group, "Накладка групи"),
+                                  ("teacher", teacher, f"Накладка викладача '{teacher}'"),
+                                  ("room", room, f"Накладка аудиторії '{room}'")):
+            keys = [(kind, name, day, variant) for variant in variants]
+            if any(occupied[key] & bit for key in keys):
+                errors.append(f"{label}: {where}")
+            for key in keys:
+                occupied[key] |= bit
+        subject_masks[(plan_key, day)] |= bit
+
+    for plan_key, (expected_hours, _) in expected.items():
+        if hours[plan_key] != expected_hours:
+            group, subject, teacher, _ = plan_key
+            errors.append(f"Група '{group}', предмет '{subject}' (викладач '{teacher}'): {hours[plan_key]} пар замість {expected_hours}")
+
+    # Здвоєні заняття: кожен блок пар поспіль має складатися з цілих занять
+    for (plan_key, day), mask in subject_masks.items():
+        duration = expected.get(plan_key, (None, 1))[1]
+        if duration > 1 and any(run % duration for run in consecutive_runs(mask)):
+            errors.append(f"Група '{plan_key[0]}', предмет '{plan_key[1]}', {day}: заняття по {duration} пар розірвані")
+
+    # Без тижневих шаблонів обидва тижні однакові — рахуємо вікна одного тижня, інакше за обидва
+    counted_variants = ("odd", "even") if has_week_patterns else ("odd",)
+    windows = sum(count_windows(mask) for (kind, _, _, variant), mask in occupied.items()
+                  if kind != "room" and variant in counted_variants)
+    return errors, windows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Перевірка згенерованого розкладу на відповідність вхідним даним.")
+    parser.add_argument("data_folder", help="Папка з groups.json, teachers.json, subjects.json, rooms.json")
+    parser.add_argument("solution", help="solution.json або schedule.xlsx")
+    parser.add_argument("--slots-per-day", type=int, default=DEFAULT_SLOTS_PER_DAY, help="Кількість пар на день")
+    args = parser.parse_args(argv)
+
+    groups, teachers, subjects, rooms = load_inputs(args.data_folder)
+    lessons = load_solution(args.solution, groups)
+    errors, windows = validate_schedule(lessons, groups, teachers, subjects, rooms, args.slots_per_day)
+    for error in errors:
+        print(error)
+    print(f"Занять: {len(lessons)}, порушень: {len(errors)}, вікон: {windows}")
+    return 1 if errors else 0
@@ -0,0 +1,76 @@
+"""
+Вимірювання часу побудови моделі CP-SAT для синтетичної великої задачі:
+послідовна побудова (1 процес) порівняно з паралельною побудовою фрагментів.
+Розв'язання не запускається — вимірюється лише побудова моделі.
+
+Приклад:
+    python benchmarks/build_model.py --groups 1000 --workers 8
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from autoscheduler.data import DAYS, create_lectures, parse_unavailable_slots  # noqa: E402
+from autoscheduler.model_builder import build_schedule_model  # noqa: E402
+
+# Багато типів аудиторій, щоб кількість допустимих аудиторій заняття не росла разом із розміром задачі
+ROOM_TYPES = [f"Тип {i}" for i in range(20)]
+
+
+def generate_instance(n_groups, slots_per_day, seed=0):
+    """Синтетичні дані: ~13 пар на групу, викладач на 5 груп, аудиторія на 2 групи."""
+    rng = random.Random(seed)
+    n_teachers = max(1, n_groups // 5 * 3)
+    teachers = [{"name": f"Викладач {i}"} for i in range(n_teachers)]
+    for teacher in rng.sample(teachers, len(teachers) // 10):
+        teacher["unavailable"] = [rng.choice(DAYS)]
+    subjects = [{"name": f"Предмет {i}", "type": ROOM_TYPES[i % len(ROOM_TYPES)]} for i in range(60)]
+    rooms = [{"name": f"Аудиторія {i}", "type": ROOM_TYPES[i % len(ROOM_TYPES)]} for i in range(max(3, n_groups // 2))]
+    groups = []
+    for g in range(n_groups):
+        group_subjects = []
+        for subject in rng.sample(subjects, 6):
+            duration = rng.choice([1, 1, 2])
+            group_subjects.append({"name": subject["name"], "teacher": rng.choice(teachers)["name"],
+                                   "hours": duration * rng.randint(1, 2), "duration": duration})
+        groups.append({"name": f"Група {g}", "subjects": group_subjects})
+    return groups, teachers, subjects, rooms
+
+
+def build_time(instance, slots_per_day, workers):
+    """Час (с) побудови моделі та її розмір (змінні, обмеження)."""
+    groups, teachers, subjects, rooms = instance
+    lectures = create_lectures(groups, len(DAYS) * slots_per_day)
+    subject_types = {s["name"]: s.get("type", "") for s in subjects}
+    teacher_unavailable = {t["name"]: parse_unavailable_slots(t.get("unavailable"), slots_per_day) for t in teachers}
+    room_unavailable = [parse_unavailable_slots(r.get("unavailable"), slots_per_day) for r in rooms]
+    start = time.perf_counter()
+    schedule_model = build_schedule_model(lectures, [g["name"] for g in groups], [t["name"] for t in teachers], rooms,
+                                          subject_types, teacher_unavailable, room_unavailable, slots_per_day, workers=workers)
+    elapsed = time.perf_counter() - start
+    proto = schedule_model.model.Proto()
+    return elapsed, len(proto.variables), len(proto.constraints)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Час побудови моделі: послідовно та паралельно.")
+    parser.add_argument("--groups", type=int, default=1000, help="Кількість груп у синтетичній задачі")
+    parser.add_argument("--slots-per-day", type=int, default=5, help="Кількість пар на день")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Кількість процесів для паралельної побудови")
+    args = parser.parse_args(argv)
+
+    instance = generate_instance(args.groups, args.slots_per_day)
+    serial, n_vars, n_constraints = build_time(instance, args.slots_per_day, 1)
+    print(f"Модель: {n_vars} змінних, {n_constraints} обмежень")
+    print(f"{'1 процес':<16} {serial:8.2f} с")
+    if args.workers > 1:
+        parallel, _, _ = build_time(instance, args.slots_per_day, args.workers)
+        print(f"{f'{args.workers} процесів':<16} {parallel:8.2f} с  (прискорення x{serial / parallel:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Вимірювання часу запуску: скільки триває імпорт ядра autoscheduler у свіжому процесі
+порівняно з GUI-модулем scheduler. Важливо для пулів процесів та пакетних запусків.
+
+Приклад:
+    python benchmarks/startup.py --repeats 10
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = {
+    "python (порожній процес)": "pass",
+    "autoscheduler (ядро)": "import autoscheduler",
+    "autoscheduler + розв'язувач": "from autoscheduler import run_solver_and_generate_reports",
+    "autoscheduler + експорт Excel": "import autoscheduler, openpyxl",
+    "scheduler (GUI)": "import scheduler",
+}
+
+
+def measure(code, repeats):
+    """Медіана часу (с) запуску свіжого інтерпретатора, що виконує code."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, check=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Час запуску ядра розкладу та GUI.")
+    parser.add_argument("--repeats", type=int, default=5, help="Кількість запусків для кожного варіанту")
+    args = parser.parse_args(argv)
+    for label, code in TARGETS.items():
+        print(f"{label:<32} {measure(code, args.repeats) * 1000:8.1f} мс")
+
+
+if __name__ == "__main__":
+    main()
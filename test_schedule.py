@@ -1,66 +1,49 @@
 import unittest
 import os
 import json
+import itertools
 import shutil
-from collections import defaultdict
-from ortools.sat.python import cp_model # Залишимо імпорт для повної сумісності, хоча в _create_lecture_objects_for_test він не використовується напряму
-
-# --- Перевизначення необхідних частин з основного скрипту для тестування ---
-# В реальному проекті ці функції імпортувались би з окремого модуля (наприклад, schedule_app.py).
-# Для демонстрації в межах Canvas, ми включаємо їх тут або створюємо спрощені версії.
-
-# Константи та клас Lecture
-DAYS = ["Пн", "Вт", "Ср", "Чт", "Пт"]
-# SLOTS_PER_DAY є динамічним, тому ми передаємо його до функції напряму.
-
-class Lecture:
-    """Представляє одну лекцію (пару) з усіма її атрибутами."""
-    def __init__(self, group, subject, teacher, count):
-        self.group = group
-        self.subject = subject
-        self.teacher = teacher
-        self.count = count # Кількість годин/пар на тиждень для цього предмета
-        self.vars = [] # Змінні CP-SAT для слотів і кімнат цієї лекції (заповнюються пізніше)
-
-def load_json_for_test(path):
-    """
-    Допоміжна функція для завантаження JSON-файлів під час тестування.
-    Не використовує messagebox для уникнення GUI під час тестів.
-    """
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        raise FileNotFoundError(f"Тестовий файл не знайдено: {path}")
-    except json.JSONDecodeError:
-        raise json.JSONDecodeError(f"Помилка декодування JSON у тестовому файлі: {path}", doc=path, pos=0)
+import subprocess
+import sys
+import time
+from unittest import mock
+from ortools.sat.python import cp_model
 
+from autoscheduler import ScheduleInputError, run_solver_and_generate_reports
+from autoscheduler.checkpoint import CheckpointCallback, load_checkpoint
+from autoscheduler.data import DAYS, create_lectures, load_json, parse_unavailable_slots
+from autoscheduler.diff import diff_solutions
+from autoscheduler.export import write_changes_manifest, write_timetable_xlsx
+from autoscheduler.loader import iter_json_records, load_inputs
+from autoscheduler.model_builder import build_schedule_model
+from autoscheduler.objectives import OBJECTIVE_STAGES, WINDOW_STAGES, build_objectives, solve_lexicographic
+from autoscheduler.profiles import apply_solver_params, size_class
+from autoscheduler.tuning import score_runs
+from autoscheduler.validator import validate_schedule
 
-# Допоміжна функція, що імітує логіку створення об'єктів Lecture з run_solver_and_generate_reports
+
+# Допоміжна функція: завантаження тестових даних і створення об'єктів Lecture через ядро autoscheduler
 def _create_lecture_objects_for_test(data_folder, mock_slots_per_day):
     """
-    Створює об'єкти Lecture на основі тестових JSON-даних.
-    Це ізольована частина логіки з run_solver_and_generate_reports,
-    що стосується лише створення об'єктів Lecture та базових перевірок.
+    Створює об'єкти Lecture на основі тестових JSON-даних
+    тими ж функціями, що використовує run_solver_and_generate_reports.
     """
-    groups = load_json_for_test(os.path.join(data_folder, "groups.json"))
-    subjects = load_json_for_test(os.path.join(data_folder, "subjects.json")) # subjects потрібні для subject_types, але не для створення Lecture безпосередньо
-    teachers = load_json_for_test(os.path.join(data_folder, "teachers.json")) # teachers потрібні для перевірки існування
-
-    lectures = []
-    _total_slots = len(DAYS) * mock_slots_per_day
-    
-    # Створення об'єктів Lecture на основі вхідних даних
-    for group in groups:
-        for subj in group["subjects"]:
-            teacher = subj["teacher"]
-            name = subj["name"]
-            count = subj["hours"]
-            # Перевірка на перевантаження годин, аналогічно оригінальній функції
-            if count > _total_slots:
-                raise ValueError(f"Предмет '{name}' для групи '{group['name']}' має {count} годин, що перевищує загальну доступну кількість слотів ({_total_slots}).")
-            lectures.append(Lecture(group["name"], name, teacher, count))
-    return lectures
+    groups = load_json(os.path.join(data_folder, "groups.json"))
+    return create_lectures(groups, len(DAYS) * mock_slots_per_day)
+
+
+def _write_single_group_inputs(data_folder):
+    """Записує найменший набір вхідних файлів: одна група з 2 парами одного викладача та одна аудиторія."""
+    os.makedirs(data_folder, exist_ok=True)
+    inputs = {
+        "groups.json": [{"name": "Г", "subjects": [{"name": "Мат", "teacher": "Петров", "hours": 2}]}],
+        "teachers.json": [{"name": "Петров"}],
+        "subjects.json": [{"name": "Мат"}],
+        "rooms.json": [{"name": "А1"}],
+    }
+    for filename, records in inputs.items():
+        with open(os.path.join(data_folder, filename), "w", encoding="utf-8") as f:
+            json.dump(records, f, ensure_ascii=False)
 
 
 class TestLectureCreation(unittest.TestCase):
@@ -149,11 +132,22 @@ class TestLectureCreation(unittest.TestCase):
         # Перевіряємо, що повідомлення про помилку містить очікуваний текст
         self.assertIn("перевищує загальну доступну кількість слотів", str(cm.exception))
 
+    def test_double_lessons_require_whole_sessions(self):
+        """
+        Тривалість заняття ділить години на окремі заняття; години, не кратні тривалості, — помилка.
+        """
+        groups = [{"name": "Г", "subjects": [{"name": "Лаб", "teacher": "Т", "hours": 4, "duration": 2}]}]
+        lectures = create_lectures(groups, 25)
+        self.assertEqual((lectures[0].duration, lectures[0].sessions), (2, 2))
+        groups[0]["subjects"][0]["hours"] = 3
+        with self.assertRaises(ScheduleInputError):
+            create_lectures(groups, 25)
+
     def test_lecture_creation_with_missing_files(self):
         """
         Тестує, що відсутність JSON-файлів викликає FileNotFoundError.
         (Цей тест перевіряє _create_lecture_objects_for_test,
-        а не повний run_solver_and_generate_reports, де є messagebox.)
+        а не повний run_solver_and_generate_reports, що перетворює її на ScheduleInputError.)
         """
         # Видаляємо один з файлів, щоб імітувати його відсутність
         os.remove(os.path.join(self.test_data_dir, "groups.json"))
@@ -162,7 +156,447 @@ class TestLectureCreation(unittest.TestCase):
         with self.assertRaises(FileNotFoundError) as cm:
             _create_lecture_objects_for_test(self.test_data_dir, 5)
         
-        self.assertIn("Тестовий файл не знайдено", str(cm.exception))
+        self.assertIn("groups.json", str(cm.exception))
+
+
+class TestUnavailableSlots(unittest.TestCase):
+
+    def test_whole_day_and_specific_pairs(self):
+        """
+        Перевіряє, що назва дня блокує увесь день, а об'єкт з "pairs" — лише вказані пари.
+        """
+        slots = parse_unavailable_slots(["Пт", {"day": "Вт", "pairs": [1, 2]}], 5)
+        self.assertEqual(slots, {20, 21, 22, 23, 24, 5, 6})
+
+    def test_missing_and_invalid_entries(self):
+        """
+        Відсутній список означає повну доступність, а невідомий день викликає ValueError.
+        """
+        self.assertEqual(parse_unavailable_slots(None, 5), set())
+        with self.assertRaises(ValueError):
+            parse_unavailable_slots(["Нд"], 5)
+        # Некоректні типи — теж ValueError (перетворюється на ScheduleInputError), а не TypeError чи AttributeError
+        for entries in ([{"day": "Пн", "pairs": ["1"]}], [5], "Пт"):
+            with self.assertRaises(ValueError):
+                parse_unavailable_slots(entries, 5)
+
+
+class TestInputLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.test_data_dir = "test_data_for_loader"
+        os.makedirs(self.test_data_dir, exist_ok=True)
+        self.groups = [{"name": "Г1", "subjects": [{"name": "Мат", "teacher": "Петров", "hours": 2}]},
+                       {"name": "Г2", "subjects": [{"name": "Мат", "teacher": "Петров", "hours": 4, "duration": 2}]}]
+        self._write("teachers.json", json.dumps([{"name": "Петров"}]))
+        self._write("subjects.json", json.dumps([{"name": "Мат", "type": "лекція"}]))
+        self._write("rooms.json", json.dumps([{"name": "А1", "type": "лекція"}]))
+
+    def tearDown(self):
+        shutil.rmtree(self.test_data_dir)
+
+    def _write(self, filename, text):
+        with open(os.path.join(self.test_data_dir, filename), "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def test_json_array_and_ndjson_are_streamed_alike(self):
+        """
+        JSON-масив (навіть розрізаний на крихітні блоки) та NDJSON дають однакові записи з інтернованими назвами.
+        """
+        self._write("groups.json", json.dumps(self.groups, ensure_ascii=False, indent=2))
+        with mock.patch("autoscheduler.loader.READ_CHUNK_SIZE", 3):
+            from_array = load_inputs(self.test_data_dir)
+        self._write("groups.json", "\n".join(json.dumps(g, ensure_ascii=False) for g in self.groups) + "\n")
+        from_ndjson = load_inputs(self.test_data_dir)
+        self.assertEqual(from_array, from_ndjson)
+        self.assertEqual(from_array[0], self.groups)
+        groups = from_ndjson[0]
+        self.assertIs(groups[0]["subjects"][0]["teacher"], groups[1]["subjects"][0]["teacher"])
+
+    def test_array_stream_matches_json_and_rejects_trailing_data(self):
+        """
+        Числа, розрізані межею блоку ("763" + ".5"), розбираються повністю, а дані після "]" — помилка.
+        """
+        path = os.path.join(self.test_data_dir, "values.json")
+        values = [763.5, -12, 1e-3, 4, True, None, "x", {"a": [1.25, 2]}, 100000]
+        self._write("values.json", json.dumps(values))
+        for chunk_size in range(1, 8):
+            with mock.patch("autoscheduler.loader.READ_CHUNK_SIZE", chunk_size):
+                self.assertEqual(list(iter_json_records(path)), values)
+        for text in ('[{"name": "Г1"}] garbage', '[1, 2][3]', '[] x'):
+            self._write("values.json", text)
+            with mock.patch("autoscheduler.loader.READ_CHUNK_SIZE", 4), self.assertRaises(json.JSONDecodeError):
+                list(iter_json_records(path))
+
+    def test_broken_references_are_reported_together(self):
+        """
+        Невідомий викладач, невідомий предмет і тип предмета без аудиторій повідомляються однією помилкою.
+        """
+        self._write("subjects.json", json.dumps([{"name": "Мат", "type": "лекція"}, {"name": "Фіз", "type": "лаб"}]))
+        self._write("groups.json", json.dumps([{"name": "Г1", "subjects": [{"name": "Мат", "teacher": "Петроф", "hours": 2},
+                                                                        {"name": "Хім", "teacher": "Петров", "hours": 2}]}]))
+        with self.assertRaises(ScheduleInputError) as cm:
+            load_inputs(self.test_data_dir)
+        message = cm.exception.message
+        self.assertIn("'Петроф' відсутній у teachers.json", message)
+        self.assertIn("'Хім' відсутній у subjects.json", message)
+        self.assertIn("немає жодної аудиторії типу 'лаб'", message)
+
+
+class TestSolverProfiles(unittest.TestCase):
+
+    def test_size_class_boundaries(self):
+        self.assertEqual(size_class(75), "small")
+        self.assertEqual(size_class(500), "medium")
+        self.assertEqual(size_class(5000), "large")
+
+    def test_profile_is_applied_to_solver(self):
+        """
+        Перевіряє, що профіль з назвою стратегії пошуку коректно записується у параметри CP-SAT.
+        """
+        solver = cp_model.CpSolver()
+        apply_solver_params(solver, {"num_workers": 4, "search_branching": "PORTFOLIO_SEARCH", "cp_model_presolve": False})
+        self.assertEqual(solver.parameters.num_workers, 4)
+        self.assertEqual(solver.parameters.search_branching, cp_model.PORTFOLIO_SEARCH)
+        self.assertFalse(solver.parameters.cp_model_presolve)
+
+    def test_unsolved_runs_rank_last(self):
+        solved = [{"status": "OPTIMAL", "objective": 0, "wall_time": 5.0}]
+        unsolved = [{"status": "UNKNOWN", "objective": None, "wall_time": 1.0}]
+        self.assertLess(score_runs(solved, 10), score_runs(unsolved, 10))
+
+
+class TestCheckpoints(unittest.TestCase):
+
+    def setUp(self):
+        self.test_data_dir = "test_data_for_checkpoint"
+        os.makedirs(self.test_data_dir, exist_ok=True)
+        self.path = os.path.join(self.test_data_dir, "checkpoint.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_data_dir)
+
+    def test_callback_saves_incumbent_and_fingerprint_is_checked(self):
+        """
+        Перевіряє, що колбек записує рішення на диск, а контрольна точка для інших даних ігнорується.
+        """
+        model = cp_model.CpModel()
+        x = model.NewIntVar(0, 5, "x")
+        y = model.NewIntVar(0, 5, "y")
+        model.Add(x + y >= 3)
+        model.Minimize(x + 2 * y)
+        callback = CheckpointCallback(self.path, "fingerprint", [("key", x, y)])
+        solver = cp_model.CpSolver()
+        solver.Solve(model, callback)
+        self.assertTrue(os.path.exists(self.path))
+        callback.save(list(solver.ResponseProto().solution), {"stage": None, "value": solver.ObjectiveValue(),
+                                                             "best_bound": solver.BestObjectiveBound(), "wall_time": solver.WallTime()})
+
+        checkpoint = load_checkpoint(self.path, "fingerprint")
+        self.assertEqual(checkpoint["assignments"], {"key": [3, 0]})
+        self.assertEqual(checkpoint["objective"], 3)
+        self.assertIsNone(load_checkpoint(self.path, "other"))
+
+    def test_skipped_incumbent_is_written_by_timer(self):
+        """
+        Рішення, знайдені до спливання інтервалу, не губляться: таймер записує останнє з них без нових рішень.
+        """
+        model = cp_model.CpModel()
+        xs = [model.NewIntVar(0, 10, f"x{i}") for i in range(100)]
+        for i in range(99):
+            model.Add(xs[i] + xs[i + 1] >= 3 + i % 9)
+        model.Minimize(cp_model.LinearExpr.WeightedSum(xs, [i % 7 + 1 for i in range(100)]))
+        model.AddDecisionStrategy(xs, cp_model.CHOOSE_FIRST, cp_model.SELECT_MAX_VALUE)
+        solver = cp_model.CpSolver()
+        solver.parameters.num_workers = 1
+        solver.parameters.search_branching = cp_model.FIXED_SEARCH
+        solver.parameters.cp_model_presolve = False
+        solver.parameters.max_time_in_seconds = 0.5
+        callback = CheckpointCallback(self.path, "fingerprint", [("key", xs[0], xs[1])], interval=0.2)
+        solver.Solve(model, callback)
+        time.sleep(0.5)
+        callback.stop()
+        checkpoint = load_checkpoint(self.path, "fingerprint")
+        self.assertEqual(checkpoint["objective"], solver.ObjectiveValue())
+        self.assertEqual(checkpoint["assignments"], {"key": [solver.Value(xs[0]), solver.Value(xs[1])]})
+
+
+class TestValidator(unittest.TestCase):
+
+    def setUp(self):
+        self.groups = [{"name": "Г1", "subjects": [{"name": "Мат", "teacher": "Петров", "hours": 2}]},
+                       {"name": "Г2", "subjects": [{"name": "Фіз", "teacher": "Петров", "hours": 1}]}]
+        self.teachers = [{"name": "Петров"}]
+        self.subjects = [{"name": "Мат", "type": "лекція"}, {"name": "Фіз", "type": "практика"}]
+        self.rooms = [{"name": "А1", "type": "лекція"}, {"name": "Л1", "type": "практика"}]
+
+    def lesson(self, group, subject, room, day, pair):
+        return {"group": group, "subject": subject, "teacher": "Петров", "room": room, "day": day, "pair": pair}
+
+    def test_valid_schedule_and_windows(self):
+        """
+        Коректний розклад не має порушень, а вікно між 1-ю та 3-ю парою рахується для групи і викладача.
+        """
+        lessons = [self.lesson("Г1", "Мат", "А1", "Пн", 1), self.lesson("Г1", "Мат", "А1", "Пн", 3),
+                   self.lesson("Г2", "Фіз", "Л1", "Вт", 1)]
+        errors, windows = validate_schedule(lessons, self.groups, self.teachers, self.subjects, self.rooms, 5)
+        self.assertEqual(errors, [])
+        self.assertEqual(windows, 2)
+
+    def test_clashes_room_types_and_hours_are_reported(self):
+        lessons = [self.lesson("Г1", "Мат", "А1", "Пн", 1), self.lesson("Г2", "Фіз", "А1", "Пн", 1)]
+        errors, _ = validate_schedule(lessons, self.groups, self.teachers, self.subjects, self.rooms, 5)
+        text = "\n".join(errors)
+        self.assertIn("Накладка викладача", text)
+        self.assertIn("Накладка аудиторії", text)
+        self.assertIn("не відповідає типу предмета", text)
+        self.assertIn("1 пар замість 2", text)
+
+    def test_same_subject_with_two_teachers(self):
+        """
+        Лекція та практика одного предмета з різними викладачами — два записи плану, а не один перезаписаний.
+        """
+        groups = [{"name": "Г1", "subjects": [{"name": "Мат", "teacher": "Петров", "hours": 1},
+                                             {"name": "Мат", "teacher": "Іванов", "hours": 2}]}]
+        teachers = [{"name": "Петров"}, {"name": "Іванов"}]
+        lessons = [self.lesson("Г1", "Мат", "А1", "Пн", 1),
+                   dict(self.lesson("Г1", "Мат", "А1", "Пн", 2), teacher="Іванов"),
+                   dict(self.lesson("Г1", "Мат", "А1", "Вт", 1), teacher="Іванов")]
+        errors, _ = validate_schedule(lessons, groups, teachers, self.subjects, self.rooms, 5)
+        self.assertEqual(errors, [])
+        errors, _ = validate_schedule(lessons[:2], groups, teachers, self.subjects, self.rooms, 5)
+        self.assertEqual(len(errors), 1)
+        self.assertIn("(викладач 'Іванов'): 1 пар замість 2", errors[0])
+
+    def test_split_double_lesson_is_reported(self):
+        self.groups[1]["subjects"][0].update(hours=2, duration=2)
+        split = [self.lesson("Г2", "Фіз", "Л1", "Вт", 1), self.lesson("Г2", "Фіз", "Л1", "Вт", 3)]
+        errors, _ = validate_schedule(split, self.groups[1:], self.teachers, self.subjects, self.rooms, 5)
+        self.assertEqual(len(errors), 1)
+        self.assertIn("розірвані", errors[0])
+        joined = [self.lesson("Г2", "Фіз", "Л1", "Вт", 2), self.lesson("Г2", "Фіз", "Л1", "Вт", 3)]
+        errors, _ = validate_schedule(joined, self.groups[1:], self.teachers, self.subjects, self.rooms, 5)
+        self.assertEqual(errors, [])
+
+    def test_odd_and_even_lessons_share_a_slot(self):
+        """
+        Заняття непарного і парного тижня можуть займати один слот, а щотижневе конфліктує з обома.
+        """
+        groups = [{"name": "Г1", "subjects": [{"name": "Мат", "teacher": "Петров", "hours": 1, "week": "odd"},
+                                             {"name": "Фіз", "teacher": "Петров", "hours": 1, "week": "even"}]}]
+        subjects = [{"name": "Мат"}, {"name": "Фіз"}]
+        shared = [dict(self.lesson("Г1", "Мат", "А1", "Пн", 1), week="odd"),
+                  dict(self.lesson("Г1", "Фіз", "А1", "Пн", 1), week="even")]
+        errors, windows = validate_schedule(shared, groups, self.teachers, subjects, self.rooms, 5)
+        self.assertEqual((errors, windows), ([], 0))
+        groups[0]["subjects"][1]["week"] = "weekly"
+        shared[1]["week"] = "weekly"
+        errors, _ = validate_schedule(shared, groups, self.teachers, subjects, self.rooms, 5)
+        self.assertIn("Накладка групи", "\n".join(errors))
+
+
+class TestScheduleDiff(unittest.TestCase):
+
+    def setUp(self):
+        self.test_data_dir = "test_data_for_diff"
+        os.makedirs(self.test_data_dir, exist_ok=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_data_dir)
+
+    def lesson(self, group, teacher, day, pair):
+        return {"group": group, "subject": "Мат", "teacher": teacher, "room": "А1", "day": day, "pair": pair}
+
+    def test_moved_lesson_marks_only_its_entities(self):
+        old = [self.lesson("Г1", "Петров", "Пн", 1), self.lesson("Г2", "Іванов", "Пн", 1)]
+        new = [self.lesson("Г1", "Петров", "Вт", 2), self.lesson("Г2", "Іванов", "Пн", 1)]
+        changes = diff_solutions(old, new)
+        self.assertEqual(list(changes["groups"]), ["Г1"])
+        self.assertEqual(list(changes["teachers"]), ["Петров"])
+        self.assertEqual(changes["groups"]["Г1"]["removed"][0]["day"], "Пн")
+        self.assertEqual(changes["groups"]["Г1"]["added"][0]["pair"], 2)
+
+    def test_full_export_removes_stale_changes_manifest(self):
+        write_changes_manifest(self.test_data_dir, {"groups": {}, "teachers": {}})
+        write_changes_manifest(self.test_data_dir, None)
+        self.assertFalse(os.path.exists(os.path.join(self.test_data_dir, "changes.json")))
+
+    def test_export_skips_unchanged_file_and_rewrites_changed(self):
+        """
+        Без змін файл не перезаписується; за будь-якої зміни файл записується повністю з актуальним розкладом.
+        """
+        from openpyxl import load_workbook
+        path = os.path.join(self.test_data_dir, "schedule.xlsx")
+        header = ["День", "Пара", "Предмет", "Викладач", "Аудиторія"]
+        write_timetable_xlsx(path, {"Г1": {"Пн": [(1, "Мат", "Петров", "А1")]},
+                                    "Г2": {"Пн": [(1, "Мат", "Іванов", "А1")]}}, header)
+        modified = os.path.getmtime(path)
+        os.utime(path, (modified - 100, modified - 100))
+        write_timetable_xlsx(path, {"Г1": {"Вт": [(2, "Мат", "Петров", "А1")]}}, header, changed_names=set())
+        self.assertEqual(os.path.getmtime(path), modified - 100)
+        write_timetable_xlsx(path, {"Г1": {"Вт": [(2, "Мат", "Петров", "А1")]},
+                                    "Г2": {"Пн": [(1, "Мат", "Іванов", "А1")]}}, header, changed_names={"Г1"})
+        wb = load_workbook(path)
+        self.assertEqual(wb.sheetnames, ["Г1", "Г2"])
+        self.assertEqual(list(wb["Г1"].iter_rows(min_row=2, values_only=True)), [("Вт", 2, "Мат", "Петров", "А1")])
+        self.assertEqual(list(wb["Г2"].iter_rows(min_row=2, values_only=True)), [("Пн", 1, "Мат", "Іванов", "А1")])
+
+
+class TestHeadlessCore(unittest.TestCase):
+
+    def test_core_import_does_not_load_gui_or_excel(self):
+        """
+        Імпорт ядра у чистому процесі не повинен тягнути tkinter та openpyxl.
+        """
+        code = "import sys, autoscheduler; print('tkinter' in sys.modules, 'openpyxl' in sys.modules)"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+        self.assertEqual(output.split(), ["False", "False"])
+
+    def test_non_solver_commands_do_not_load_ortools(self):
+        """
+        diff, перевірка розкладу та завантаження даних не повинні імпортувати OR-Tools та пул процесів.
+        """
+        code = ("import sys, autoscheduler.diff, autoscheduler.validator; "
+                "print('ortools' in sys.modules, 'concurrent.futures.process' in sys.modules); "
+                "from autoscheduler import run_solver_and_generate_reports; print('ortools' in sys.modules)")
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+        self.assertEqual(output.split(), ["False", "False", "True"])
+
+    def test_timeout_is_not_reported_as_infeasible(self):
+        """
+        Ліміт часу, вичерпаний до першого рішення, повідомляється як тайм-аут, а не як конфлікт у вхідних даних.
+        """
+        data_dir = "test_data_for_timeout"
+        _write_single_group_inputs(data_dir)
+        self.addCleanup(shutil.rmtree, data_dir)
+        run_info = {}
+        timetable, _, report_text, status_message = run_solver_and_generate_reports(
+            data_dir, "default", 5, time_limit=0, export=False, run_info=run_info)
+        self.assertIsNone(timetable)
+        self.assertEqual(run_info["status"], "UNKNOWN")
+        self.assertIn("Ліміт часу", status_message)
+        self.assertNotIn("конфлікти у вхідних даних", report_text)
+
+    def test_input_errors_are_structured(self):
+        with self.assertRaises(ScheduleInputError) as cm:
+            run_solver_and_generate_reports("folder_that_does_not_exist", "default", 5)
+        self.assertEqual(cm.exception.status, "Помилка вхідних даних: відсутні файли.")
+        with self.assertRaises(ScheduleInputError) as cm:
+            run_solver_and_generate_reports("folder_that_does_not_exist", "default", "abc")
+        self.assertEqual(cm.exception.title, "Помилка вводу")
+
+
+class TestModelBuilder(unittest.TestCase):
+
+    def _build(self, workers):
+        groups = [{"name": "Г1", "subjects": [{"name": "Мат", "teacher": "Петров", "hours": 4, "duration": 2},
+                                             {"name": "Фіз", "teacher": "Іванов", "hours": 2}]},
+                  {"name": "Г2", "subjects": [{"name": "Мат", "teacher": "Петров", "hours": 2},
+                                             {"name": "Фіз", "teacher": "Іванов", "hours": 1}]}]
+        rooms = [{"name": "А1", "type": ""}, {"name": "Лаб", "type": "lab"}, {"name": "Лаб2", "type": "lab"}]
+        lectures = create_lectures(groups, len(DAYS) * 4)
+        return build_schedule_model(lectures, ["Г1", "Г2"], ["Петров", "Іванов"], rooms, {"Мат": "", "Фіз": "lab"},
+                                    {"Петров": {0, 1}}, [set(), {4}, set()], 4, workers=workers)
+
+    def test_parallel_build_matches_serial_and_is_solvable(self):
+        """
+        Фрагменти, побудовані в окремих процесах, дають ту саму модель, що й послідовна побудова.
+        """
+        serial = self._build(1)
+        parallel = self._build(2)
+        self.assertEqual(str(parallel.model.Proto()), str(serial.model.Proto()))
+        solver = cp_model.CpSolver()
+        self.assertEqual(solver.Solve(parallel.model), cp_model.OPTIMAL)
+        for lecture in parallel.lectures:
+            for slot, room in lecture.vars:
+                self.assertIn(solver.Value(slot), lecture.allowed_starts)
+                self.assertIn(solver.Value(room), lecture.allowed_rooms)
+                if lecture.teacher == "Петров":
+                    self.assertNotIn(solver.Value(slot), {0, 1})
+
+
+class TestLexicographicObjectives(unittest.TestCase):
+
+    def test_unavoidable_window_is_counted_and_stages_run_in_order(self):
+        """
+        Викладач доступний лише у 1-й та 3-й парі понеділка — вікно групи неминуче і має бути пораховане.
+        """
+        groups = [{"name": "Г", "subjects": [{"name": "Мат", "teacher": "Петров", "hours": 2}]}]
+        slots_per_day = 3
+        teacher_unavailable = {"Петров": set(range(len(DAYS) * slots_per_day)) - {0, 2}}
+        lectures = create_lectures(groups, len(DAYS) * slots_per_day)
+        schedule_model = build_schedule_model(lectures, ["Г"], ["Петров"], [{"name": "А1"}], {"Мат": ""},
+                                              teacher_unavailable, [set()], slots_per_day, workers=1)
+        objectives = build_objectives(schedule_model, slots_per_day)
+        status, solution, stage_results = solve_lexicographic(cp_model.CpSolver(), schedule_model.model, objectives)
+        self.assertEqual(status, cp_model.OPTIMAL)
+        self.assertEqual([result["stage"] for result in stage_results], OBJECTIVE_STAGES)
+        values = {result["stage"]: result["value"] for result in stage_results}
+        self.assertEqual((values["group_windows"], values["teacher_windows"], values["worst_teacher_windows"]), (1, 1, 1))
+        self.assertEqual(len(solution), len(schedule_model.model.Proto().variables))
+
+    def test_balance_stage_does_not_decide_status(self):
+        """
+        Етап рівномірності навантаження без рішення (ліміт 0 с) не робить загальний статус FEASIBLE.
+        """
+        groups = [{"name": "Г", "subjects": [{"name": "Мат", "teacher": "Петров", "hours": 3}]}]
+        slots_per_day = 3
+        lectures = create_lectures(groups, len(DAYS) * slots_per_day)
+        schedule_model = build_schedule_model(lectures, ["Г"], ["Петров"], [{"name": "А1"}], {"Мат": ""},
+                                              {"Петров": set()}, [set()], slots_per_day, workers=1)
+        objectives = build_objectives(schedule_model, slots_per_day)
+        status, solution, stage_results = solve_lexicographic(cp_model.CpSolver(), schedule_model.model, objectives,
+                                                              stage_limits={"day_load": {"time_limit": 0}})
+        self.assertEqual(status, cp_model.OPTIMAL)
+        self.assertIsNotNone(solution)
+        self.assertEqual([result["status"] for result in stage_results if result["stage"] in WINDOW_STAGES], ["OPTIMAL"] * len(WINDOW_STAGES))
+
+    def test_time_limit_used_up_by_first_stage(self):
+        """
+        Перший етап вичерпує загальний time_limit, решта етапів не отримують часу —
+        run_info["objective"] рахується за знайденим рішенням, а не падає на відсутніх значеннях етапів.
+        """
+        data_dir = "test_data_for_time_limit"
+        _write_single_group_inputs(data_dir)
+        self.addCleanup(shutil.rmtree, data_dir)
+        # Годинник: дедлайн і перший етап — у момент 0, усі наступні етапи — вже після дедлайну
+        clock = itertools.chain([0.0, 0.0], itertools.repeat(100.0))
+        run_info = {}
+        with mock.patch("autoscheduler.objectives.time.monotonic", side_effect=lambda: next(clock)):
+            run_solver_and_generate_reports(data_dir, "default", 5, time_limit=10, export=False, run_info=run_info)
+        self.assertEqual(run_info["stages"][0]["status"], "OPTIMAL")
+        self.assertIsNone(run_info["stages"][1]["value"])
+        # Вікна не доведено оптимальними — етап рівномірності навантаження не запускається
+        self.assertEqual(run_info["stages"][-1]["status"], "SKIPPED")
+        self.assertEqual(run_info["status"], "FEASIBLE")
+        self.assertEqual(run_info["objective"], 0)
+
+    def test_odd_and_even_lessons_fit_into_one_weekly_model(self):
+        """
+        4 пари щотижня та по 2 пари непарного і парного тижня вміщуються у 6 слотів лише завдяки спільним слотам.
+        """
+        groups = [{"name": "Г", "subjects": [{"name": "Мат", "teacher": "Петров", "hours": 4},
+                                            {"name": "Фіз", "teacher": "Іванов", "hours": 2, "week": "odd"},
+                                            {"name": "Хім", "teacher": "Сидоров", "hours": 2, "week": "even"}]}]
+        teachers = ["Петров", "Іванов", "Сидоров"]
+        slots_per_day = 6
+        # Доступні лише понеділок і вівторок по 3 пари — 6 слотів на тиждень
+        available = {0, 1, 2, 6, 7, 8}
+        unavailable = set(range(len(DAYS) * slots_per_day)) - available
+        lectures = create_lectures(groups, len(DAYS) * slots_per_day)
+        schedule_model = build_schedule_model(lectures, ["Г"], teachers, [{"name": "А1"}, {"name": "А2"}], {},
+                                              {t: unavailable for t in teachers}, [set(), set()], slots_per_day, workers=1)
+        self.assertEqual(set(schedule_model.group_occupied["Г"]), {"odd", "even"})
+        solver = cp_model.CpSolver()
+        self.assertEqual(solver.Solve(schedule_model.model), cp_model.OPTIMAL)
+        lessons = [{"group": lec.group, "subject": lec.subject, "teacher": lec.teacher, "room": "А" + str(solver.Value(room) + 1),
+                    "day": DAYS[solver.Value(slot) // slots_per_day], "pair": solver.Value(slot) % slots_per_day + 1, "week": lec.week}
+                   for lec in schedule_model.lectures for slot, room in lec.vars]
+        errors, _ = validate_schedule(lessons, groups, [{"name": t} for t in teachers],
+                                      [{"name": "Мат"}, {"name": "Фіз"}, {"name": "Хім"}], [{"name": "А1"}, {"name": "А2"}], slots_per_day)
+        self.assertEqual(errors, [])
 
 
 if __name__ == '__main__':